@@ -111,21 +111,47 @@ def setup_anthropic():
        Perfect for complex cybersecurity scenarios
     """)
 
+# Parsed .env contents, keyed by path -> (mtime, {key: value})
+_ENV_CACHE = {}
+
+_SHOWN_KEYS = frozenset({'LLM_PROVIDER', 'MODEL_NAME', 'OPENAI_API_KEY', 'ANTHROPIC_API_KEY'})
+_SHOWN_PREFIX = 'OLLAMA'  # OLLAMA_HOST, OLLAMA_MODEL, ...
+
+def load_env_config(env_file):
+    """Parse .env into a dict, re-reading only when the file's mtime changes"""
+    try:
+        mtime = os.stat(env_file).st_mtime
+    except OSError:
+        return None
+    
+    cached = _ENV_CACHE.get(env_file)
+    if cached and cached[0] == mtime:
+        return cached[1]
+    
+    with open(env_file) as f:
+        text = f.read()
+    config = dict(
+        line.split('=', 1) for line in text.splitlines()
+        if '=' in line and not line.startswith('#')
+    )
+    _ENV_CACHE[env_file] = (mtime, config)
+    return config
+
 def show_current_config():
     print("\n" + "="*60)
     print("📋 Current Configuration")
     print("="*60)
     env_file = Path(__file__).parent / ".env"
-    if env_file.exists():
-        with open(env_file) as f:
-            config = f.read()
-            # Show only important lines
-            for line in config.split('\n'):
-                if line.startswith(('LLM_PROVIDER', 'MODEL_NAME', 'OPENAI_API_KEY', 'ANTHROPIC_API_KEY', 'OLLAMA')):
-                    if 'KEY' in line and len(line.split('=')[1].strip()) > 2:
-                        print(f"✅ {line.split('=')[0]} = ••••••••••••")
-                    else:
-                        print(f"   {line}")
+    config = load_env_config(env_file)
+    if config is None:
+        return
+    # Show only important lines
+    for key, value in config.items():
+        if key in _SHOWN_KEYS or key.startswith(_SHOWN_PREFIX):
+            if 'KEY' in key and len(value.strip()) > 2:
+                print(f"✅ {key} = ••••••••••••")
+            else:
+                print(f"   {key}={value}")
 
 if __name__ == "__main__":
     show_banner()
@@ -4,157 +4,186 @@
 Deployment-ready web application
 """
 
-import gradio as gr
-from typing import Optional
+import os
 import sys
+import threading
 
-# Import configuration
-from config import settings, SYSTEM_PROMPT
-
-# Import modules
-from modules.ai_engine import AIEngine
-from modules.safety import check_safety
-from modules.knowledge_base import knowledge_base
-
-# Initialize AI Engine
-def init_ai():
-    """Initialize AI Engine"""
-    api_key = None
-    if settings.llm_provider == "openai":
-        api_key = settings.openai_api_key
-    elif settings.llm_provider == "anthropic":
-        api_key = settings.anthropic_api_key
-    
-    return AIEngine(
-        provider=settings.llm_provider,
-        api_key=api_key,
-        model=settings.model_name,
-        max_tokens=settings.max_tokens,
-        temperature=settings.temperature,
-        system_prompt=SYSTEM_PROMPT
-    )
+from handlers import (
+    ai_available,
+    chat_with_spider,
+    demo_chat,
+    warmup_ai,
+    prefetch_chat,
+    get_random_flashcard,
+    get_quiz_questions,
+    get_quiz_answers,
+    search_mitre,
+    get_incident_template,
+    get_vuln_template,
+    get_hardening_checklist,
+)
 
-# Global AI instance - initialize lazily
-ai_engine = None
-conversation_history = []
-
-def get_ai_engine():
-    global ai_engine
-    if ai_engine is None:
-        ai_engine = init_ai()
-    return ai_engine
+# gradio is imported inside create_interface() so that importing this
+# module stays cheap when the UI is not launched.
 
 # ============================================================================
-# Chat Functions
+# Gradio Interface
 # ============================================================================
 
-def chat_with_spider(message: str, chat_history: list) -> tuple[str, list]:
-    """Process user message and return AI response"""
-    global conversation_history
-    
-    # Safety check
-    is_safe, safety_message = check_safety(message)
-    if not is_safe:
-        return safety_message, chat_history
-    
-    try:
-        # Get AI engine
-        ai = get_ai_engine()
-        
-        # Get AI response
-        response = ai.chat(message, stream=False)
-        
-        # Update chat history
-        chat_history.append((message, response))
-        
-        return response, chat_history
-    
-    except Exception as e:
-        error_msg = f"❌ Error: {str(e)}"
-        chat_history.append((message, error_msg))
-        return error_msg, chat_history
+HEADER_MD = """
+# 🕷️ Spider - AI-Powered Cybersecurity Tutor
 
-# ============================================================================
-# Knowledge Base Functions
-# ============================================================================
+Your friendly voice-enabled cybersecurity learning companion. Ask questions, 
+get insights from MITRE ATT&CK, access templates, and more!
+"""
 
-def get_random_flashcard() -> str:
-    """Get a random flashcard"""
-    cards = knowledge_base.get_flashcards(count=1)
-    if cards:
-        card = cards[0]
-        return f"""
-### 🎴 Flashcard
+ABOUT_MD = """
+## About Spider Tutor
 
-**Question:** {card.question}
+Spider is an AI-powered cybersecurity tutor that helps you learn and understand
+cybersecurity concepts, MITRE ATT&CK framework, security best practices, and more.
 
-**Answer:** {card.answer}
+### Features
+- 💬 Interactive AI chat with cybersecurity expertise
+- 🎴 Flashcards for studying
+- 📝 Quiz questions to test your knowledge
+- 🎯 MITRE ATT&CK framework lookup
+- 📋 Security report templates
+- ✅ Hardening checklists
 
-**Category:** {card.category} | **Difficulty:** {card.difficulty}
-        """
-    return "No flashcards available"
+### LLM Providers
+- OpenAI GPT-4o-mini (Recommended)
+- Anthropic Claude
+- Ollama (Local, offline)
 
-def get_quiz_questions(num_questions: int = 5) -> str:
-    """Get quiz questions"""
-    quiz = knowledge_base.get_quiz(count=num_questions)
-    return knowledge_base.format_quiz(quiz, show_answers=False)
+### Created by
+**Dhamodharaprashad**
 
-def get_quiz_answers(num_questions: int = 5) -> str:
-    """Get quiz answers"""
-    quiz = knowledge_base.get_quiz(count=num_questions)
-    return knowledge_base.format_quiz(quiz, show_answers=True)
+---
 
-def search_mitre(tech_id: str) -> str:
-    """Search MITRE ATT&CK technique"""
-    if not tech_id:
-        return "Please enter a technique ID (e.g., T1566)"
-    
-    tech_id = tech_id.strip().upper()
-    if not tech_id.startswith("T"):
-        tech_id = "T" + tech_id
-    
-    tech = knowledge_base.get_mitre_technique(tech_id)
-    if tech:
-        return knowledge_base.format_mitre_technique(tech)
-    
-    # Try searching
-    results = knowledge_base.search_mitre(tech_id.replace("T", ""))
-    if results:
-        output = f"Found {len(results)} techniques:\n\n"
-        for t in results:
-            output += f"• **{t.technique_id}: {t.name}**\n"
-        return output
-    
-    return f"❌ Technique '{tech_id}' not found"
+**Note:** Keep your API keys secure. Never share them publicly.
+"""
 
-def get_incident_template() -> str:
-    """Get incident report template"""
-    return knowledge_base.get_incident_template()
+STANDALONE_HEADER_MD = """
+# 🕷️ Spider - AI-Powered Cybersecurity Tutor
 
-def get_vuln_template() -> str:
-    """Get vulnerability report template"""
-    return knowledge_base.get_vulnerability_template()
+Your friendly learning companion for cybersecurity education.
+**Fully responsive on mobile and desktop** 📱💻
+"""
 
-def get_hardening_checklist(system_type: str = "general") -> str:
-    """Get hardening checklist"""
-    return knowledge_base.get_hardening_checklist(system_type)
+STANDALONE_ABOUT_MD = """
+## About Spider Tutor
 
-# ============================================================================
-# Gradio Interface
-# ============================================================================
+Spider is an AI-powered cybersecurity learning platform.
+
+### Features
+- 💬 AI Chat - Instant cybersecurity guidance
+- 🎴 Flashcards - Study mode
+- 📝 Quizzes - Test knowledge
+- 🎯 MITRE ATT&CK - Technique lookup
+- 📋 Templates - Report templates
+- ✅ Checklists - Hardening guides
+
+### Device Support
+✅ Mobile (iOS, Android)
+✅ Tablet
+✅ Desktop (Windows, Mac, Linux)
+
+### Created by
+**Dhamodharaprashad**
+
+Stay secure! 🔒
+"""
 
-def create_interface():
-    """Create Gradio interface"""
+# Responsive layout used by the HuggingFace Spaces build
+STANDALONE_CSS = """
+@media (max-width: 768px) {
+    .gradio-container {
+        max-width: 100% !important;
+        padding: 10px !important;
+    }
+
+    .gradio-block {
+        padding: 10px !important;
+    }
+
+    .gradio-textbox, textarea {
+        font-size: 16px !important;
+    }
+
+    .gradio-button {
+        font-size: 14px !important;
+        padding: 8px !important;
+    }
+
+    .gradio-slider, .gradio-radio {
+        margin: 10px 0 !important;
+    }
+
+    h1, h2, h3 {
+        font-size: 1.2em !important;
+    }
+}
+
+@media (max-width: 480px) {
+    .gradio-container {
+        padding: 5px !important;
+    }
+
+    h1 { font-size: 1em !important; }
+    h2 { font-size: 0.95em !important; }
+
+    .gradio-tabs {
+        overflow-x: auto !important;
+    }
+}
+
+.gradio-chatbot {
+    min-height: 400px !important;
+}
+
+@media (max-width: 768px) {
+    .gradio-chatbot {
+        min-height: 300px !important;
+    }
+}
+"""
+
+# Gradio queue tuning: LLM calls are slow, lookups are cheap
+QUEUE_CONCURRENCY = 8
+QUEUE_MAX_SIZE = 64
+# One chat turn at a time: every session shares the single AIEngine and its
+# unlocked Conversation, so concurrent turns would interleave one history
+CHAT_CONCURRENCY = 1
+LOOKUP_CONCURRENCY = 16
+# Sync handlers run in the server threadpool (Gradio default: 40)
+MAX_THREADS = 80
+# Gradio's own share tunnel is opt-in (SPIDER_SHARE=1); Spaces or
+# tunnel.py already expose the app, and the tunnel adds a relay hop
+SHARE_LINK = os.environ.get("SPIDER_SHARE", "0") == "1"
+
+def create_interface(standalone: bool = False):
+    """
+    Create Gradio interface
+    
+    Args:
+        standalone: Use the responsive HuggingFace Spaces layout and fall back
+            to demo chat responses when the AI engine cannot be loaded
+    """
+    import gradio as gr
     
-    with gr.Blocks(title="🕷️ Spider - Cybersecurity Tutor", theme=gr.themes.Soft()) as demo:
+    chat_fn = chat_with_spider
+    if standalone and not ai_available():
+        chat_fn = demo_chat
+    
+    with gr.Blocks(
+        title="🕷️ Spider - Cybersecurity Tutor",
+        theme=gr.themes.Soft(),
+        css=STANDALONE_CSS if standalone else None
+    ) as demo:
         
         # Header
-        gr.Markdown("""
-        # 🕷️ Spider - AI-Powered Cybersecurity Tutor
-        
-        Your friendly voice-enabled cybersecurity learning companion. Ask questions, 
-        get insights from MITRE ATT&CK, access templates, and more!
-        """)
+        gr.Markdown(STANDALONE_HEADER_MD if standalone else HEADER_MD)
         
         # ====== Main Chat Tab ======
         with gr.Tab("💬 Chat"):
@@ -163,7 +192,8 @@ def create_interface():
             chatbot = gr.Chatbot(
                 label="Spider Chat",
                 height=500,
-                show_copy_button=True
+                show_copy_button=True,
+                type="messages"
             )
             
             with gr.Row():
@@ -174,21 +204,36 @@ def create_interface():
                 )
                 submit_btn = gr.Button("Send", scale=1)
             
-            # Submit handler
-            def submit_message(message, history):
-                return chat_with_spider(message, history)
-            
             submit_btn.click(
-                submit_message,
+                chat_fn,
                 inputs=[user_input, chatbot],
-                outputs=[user_input, chatbot]
+                outputs=[user_input, chatbot],
+                concurrency_limit=CHAT_CONCURRENCY,
+                concurrency_id="chat"
             )
             
             user_input.submit(
-                submit_message,
+                chat_fn,
                 inputs=[user_input, chatbot],
-                outputs=[user_input, chatbot]
+                outputs=[user_input, chatbot],
+                concurrency_limit=CHAT_CONCURRENCY,
+                concurrency_id="chat"
             )
+            
+            if chat_fn is chat_with_spider:
+                # Keystrokes bypass the queue so they never take slots from
+                # chat/lookups; the frontend sends only the latest one and
+                # the handler debounces bursts (PREFETCH_DEBOUNCE) against
+                # this session's last keystroke time
+                keystroke_state = gr.State(0.0)
+                user_input.input(
+                    prefetch_chat,
+                    inputs=[user_input, keystroke_state],
+                    outputs=keystroke_state,
+                    trigger_mode="always_last",
+                    show_progress="hidden",
+                    queue=False
+                )
         
         # ====== Flashcard Tab ======
         with gr.Tab("🎴 Flashcards"):
@@ -198,7 +243,8 @@ def create_interface():
             flashcard_btn = gr.Button("Get Random Flashcard")
             flashcard_btn.click(
                 get_random_flashcard,
-                outputs=flashcard_output
+                outputs=flashcard_output,
+                concurrency_limit=LOOKUP_CONCURRENCY
             )
         
         # ====== Quiz Tab ======
@@ -215,6 +261,8 @@ def create_interface():
                 )
             
             quiz_output = gr.Markdown()
+            # This session's current quiz, for "Show Answers"
+            quiz_state = gr.State([])
             
             with gr.Row():
                 quiz_btn = gr.Button("Generate Quiz")
@@ -223,13 +271,15 @@ def create_interface():
             quiz_btn.click(
                 get_quiz_questions,
                 inputs=num_questions,
-                outputs=quiz_output
+                outputs=[quiz_output, quiz_state],
+                concurrency_limit=LOOKUP_CONCURRENCY
             )
             
             answers_btn.click(
                 get_quiz_answers,
-                inputs=num_questions,
-                outputs=quiz_output
+                inputs=quiz_state,
+                outputs=quiz_output,
+                concurrency_limit=LOOKUP_CONCURRENCY
             )
         
         # ====== MITRE ATT&CK Tab ======
@@ -249,13 +299,15 @@ def create_interface():
             mitre_btn.click(
                 search_mitre,
                 inputs=mitre_input,
-                outputs=mitre_output
+                outputs=mitre_output,
+                concurrency_limit=LOOKUP_CONCURRENCY
             )
             
             mitre_input.submit(
                 search_mitre,
                 inputs=mitre_input,
-                outputs=mitre_output
+                outputs=mitre_output,
+                concurrency_limit=LOOKUP_CONCURRENCY
             )
         
         # ====== Templates Tab ======
@@ -270,12 +322,14 @@ def create_interface():
             
             incident_btn.click(
                 get_incident_template,
-                outputs=template_output
+                outputs=template_output,
+                concurrency_limit=LOOKUP_CONCURRENCY
             )
             
             vuln_btn.click(
                 get_vuln_template,
-                outputs=template_output
+                outputs=template_output,
+                concurrency_limit=LOOKUP_CONCURRENCY
             )
         
         # ====== Hardening Checklist Tab ======
@@ -294,47 +348,28 @@ def create_interface():
             checklist_btn.click(
                 get_hardening_checklist,
                 inputs=system_type,
-                outputs=checklist_output
+                outputs=checklist_output,
+                concurrency_limit=LOOKUP_CONCURRENCY
             )
         
         # ====== About Tab ======
         with gr.Tab("ℹ️ About"):
-            gr.Markdown("""
-            ## About Spider Tutor
-            
-            Spider is an AI-powered cybersecurity tutor that helps you learn and understand
-            cybersecurity concepts, MITRE ATT&CK framework, security best practices, and more.
-            
-            ### Features
-            - 💬 Interactive AI chat with cybersecurity expertise
-            - 🎴 Flashcards for studying
-            - 📝 Quiz questions to test your knowledge
-            - 🎯 MITRE ATT&CK framework lookup
-            - 📋 Security report templates
-            - ✅ Hardening checklists
-            
-            ### LLM Providers
-            - OpenAI GPT-4o-mini (Recommended)
-            - Anthropic Claude
-            - Ollama (Local, offline)
-            
-            ### Created by
-            **Dhamodharaprashad**
-            
-            ---
-            
-            **Note:** Keep your API keys secure. Never share them publicly.
-            """)
+            gr.Markdown(STANDALONE_ABOUT_MD if standalone else ABOUT_MD)
     
+    demo.queue(default_concurrency_limit=QUEUE_CONCURRENCY, max_size=QUEUE_MAX_SIZE)
     return demo
 
 if __name__ == "__main__":
     demo = create_interface()
     
-    # Launch with public sharing
+    # Build the AI engine while the UI starts so the first message doesn't pay for it
+    threading.Thread(target=warmup_ai, daemon=True).start()
+    
+    # Launch (public share link only with SPIDER_SHARE=1)
     demo.launch(
         server_name="0.0.0.0",
         server_port=7860,
-        share=True,
-        show_error=True
+        share=SHARE_LINK,
+        show_error=True,
+        max_threads=MAX_THREADS
     )
@@ -2,14 +2,25 @@
 Spider Cybersecurity Tutor - Configuration
 """
 
-import os
+from functools import lru_cache
 from pathlib import Path
 from dotenv import load_dotenv
-from pydantic import BaseModel
-from typing import Optional
+from pydantic_settings import BaseSettings, SettingsConfigDict
+from typing import ClassVar, Optional
+
+_dotenv_loaded = False
+
+
+def load_env():
+    """Load .env into os.environ once per process"""
+    global _dotenv_loaded
+    if not _dotenv_loaded:
+        load_dotenv()
+        _dotenv_loaded = True
+
 
 # Load environment variables
-load_dotenv()
+load_env()
 
 # Base paths
 BASE_DIR = Path(__file__).parent
@@ -17,35 +28,44 @@ DATA_DIR = BASE_DIR / "data"
 MODULES_DIR = BASE_DIR / "modules"
 
 
-class Settings(BaseModel):
-    """Application settings"""
+class Settings(BaseSettings):
+    """Application settings, read from the environment (and .env via load_env)"""
+    
+    model_config = SettingsConfigDict(frozen=True, case_sensitive=False)
     
     # API Keys
-    openai_api_key: Optional[str] = os.getenv("OPENAI_API_KEY")
-    anthropic_api_key: Optional[str] = os.getenv("ANTHROPIC_API_KEY")
+    openai_api_key: Optional[str] = None
+    anthropic_api_key: Optional[str] = None
     
     # LLM Settings
-    llm_provider: str = os.getenv("LLM_PROVIDER", "openai")
-    model_name: str = os.getenv("MODEL_NAME", "gpt-4o-mini")
-    ollama_host: str = os.getenv("OLLAMA_HOST", "http://localhost:11434")
-    ollama_model: str = os.getenv("OLLAMA_MODEL", "neural-chat")
-    max_tokens: int = int(os.getenv("MAX_TOKENS", "2048"))
-    temperature: float = float(os.getenv("TEMPERATURE", "0.7"))
+    llm_provider: str = "openai"
+    model_name: str = "gpt-4o-mini"
+    ollama_host: str = "http://localhost:11434"
+    ollama_model: str = "neural-chat"
+    max_tokens: int = 2048
+    temperature: float = 0.7
     
     # Voice Settings
-    voice_enabled: bool = os.getenv("VOICE_ENABLED", "true").lower() == "true"
-    tts_engine: str = os.getenv("TTS_ENGINE", "pyttsx3")
-    stt_engine: str = os.getenv("STT_ENGINE", "google")
-    voice_rate: int = int(os.getenv("VOICE_RATE", "175"))
+    voice_enabled: bool = True
+    tts_engine: str = "pyttsx3"
+    stt_engine: str = "google"
+    voice_rate: int = 175
     
-    # App Settings
-    app_name: str = "Spider"
-    version: str = "1.0.0"
-    debug: bool = os.getenv("DEBUG", "false").lower() == "true"
+    # App Settings (fixed, not overridable from the environment)
+    app_name: ClassVar[str] = "Spider"
+    version: ClassVar[str] = "1.0.0"
+    debug: bool = False
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Return the shared Settings instance, built on first call"""
+    load_env()
+    return Settings()
 
 
 # Global settings instance
-settings = Settings()
+settings = get_settings()
 
 
 # System Prompt for Spider
@@ -85,21 +105,21 @@ Be approachable, professional, and voice-friendly. Use short sentences suitable
 
 
 # Dangerous keywords for safety filtering
-DANGEROUS_KEYWORDS = [
+DANGEROUS_KEYWORDS = frozenset([
     "exploit code", "payload", "shell code", "reverse shell",
     "bypass authentication", "crack password", "brute force",
     "sql injection payload", "xss payload", "malware code",
     "ransomware", "keylogger code", "rootkit", "botnet",
     "ddos attack", "hack into", "break into", "steal credentials",
     "exploit vulnerability", "zero day exploit"
-]
+])
 
 # Safe topics for cybersecurity education
-SAFE_TOPICS = [
+SAFE_TOPICS = frozenset([
     "security concepts", "defense", "detection", "monitoring",
     "hardening", "compliance", "risk assessment", "incident response",
     "security architecture", "encryption", "authentication",
     "access control", "security awareness", "threat modeling",
     "vulnerability management", "patch management", "backup",
     "disaster recovery", "security policy", "audit", "forensics basics"
-]
\ No newline at end of file
+])
\ No newline at end of file
@@ -5,8 +5,21 @@ Spider Tutor Demo - Test the application functionality
 
 import sys
 import time
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from modules.ai_engine import generate_response, OllamaChat
 
+OLLAMA_URL = "http://localhost:11434"
+
+# Shared keep-alive connection pool for Ollama HTTP calls
+_SESSION = requests.Session()
+_SESSION.mount("http://", HTTPAdapter(
+    pool_connections=10,
+    pool_maxsize=32,
+    max_retries=Retry(total=2, backoff_factor=0.1)
+))
+
 def test_ollama_connection():
     """Test connection to Ollama server"""
     print("🔍 Testing Ollama connection...")
@@ -40,8 +53,7 @@ def show_status():
     
     # Check Ollama
     try:
-        import requests
-        response = requests.get("http://localhost:11434/api/tags", timeout=2)
+        response = _SESSION.get(f"{OLLAMA_URL}/api/tags", timeout=2)
         models = response.json().get("models", [])
         print(f"\n📦 Ollama Server: ✅ Running")
         print(f"   Available models: {len(models)}")
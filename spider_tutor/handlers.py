@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+🕷️ Spider - Gradio Handlers
+Chat and knowledge base callbacks shared by app.py and app_standalone.py
+"""
+
+from functools import lru_cache
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+# Import modules (stdlib-only, cheap to load)
+from modules.safety import check_safety, is_trivially_safe
+from modules.knowledge_base import knowledge_base, normalize_technique_id
+
+# config (pydantic/dotenv) and the LLM SDKs are imported on first use
+# so that importing this module stays cheap when the UI is not launched.
+
+@lru_cache(maxsize=None)
+def ai_available() -> bool:
+    """Check whether the AI engine dependencies can be imported"""
+    try:
+        import config
+        import modules.ai_engine
+    except Exception:
+        print("⚠️  Running in demo mode - some features limited")
+        return False
+    return True
+
+# Initialize AI Engine
+def init_ai():
+    """Initialize AI Engine"""
+    from config import settings, SYSTEM_PROMPT
+    from modules.ai_engine import AIEngine
+    
+    api_key = None
+    if settings.llm_provider == "openai":
+        api_key = settings.openai_api_key
+    elif settings.llm_provider == "anthropic":
+        api_key = settings.anthropic_api_key
+    
+    return AIEngine(
+        provider=settings.llm_provider,
+        api_key=api_key,
+        model=settings.model_name,
+        max_tokens=settings.max_tokens,
+        temperature=settings.temperature,
+        system_prompt=SYSTEM_PROMPT
+    )
+
+# Global AI instance - warmed up in the background at launch
+ai_engine = None
+_ai_engine_lock = threading.Lock()
+
+def get_ai_engine():
+    global ai_engine
+    if ai_engine is None:
+        with _ai_engine_lock:
+            if ai_engine is None:
+                ai_engine = init_ai()
+    return ai_engine
+
+def warmup_ai():
+    """Build the AI engine and pre-load the model before the first message"""
+    get_ai_engine().warmup()
+
+# Keystrokes closer together than this (seconds) are one typing burst;
+# only the first keystroke of a burst prefetches
+PREFETCH_DEBOUNCE = 0.2
+
+def prefetch_chat(message: str, last_keystroke: float) -> float:
+    """
+    Warm the AI connection while the user types (bound to Textbox.input)
+    
+    Args:
+        message: Current textbox contents
+        last_keystroke: This session's previous keystroke time, kept in
+            the caller's gr.State so one user's typing never debounces another's
+        
+    Returns:
+        The new keystroke time, to store back in that state
+    """
+    now = time.monotonic()
+    if now - (last_keystroke or 0.0) >= PREFETCH_DEBOUNCE:
+        if message.strip() and ai_available():
+            get_ai_engine().prefetch()
+    return now
+
+# ============================================================================
+# Chat Functions
+# ============================================================================
+
+# Maximum chat turns kept (and re-sent to the browser) per session.
+# Gradio's chat_history is the only copy of the transcript on this side,
+# in "messages" format: one user and one assistant dict per turn.
+MAX_CHAT_HISTORY = 50
+
+# Longer messages are rejected before the safety check and LLM call
+MAX_MESSAGE_LENGTH = 4000
+TOO_LONG_MESSAGE = f"❌ Message too long - please keep questions under {MAX_MESSAGE_LENGTH} characters."
+
+# Seconds between streamed chat updates sent to the browser
+STREAM_FLUSH_INTERVAL = 0.025
+
+def _trim_history(chat_history: list):
+    """Drop the oldest turns so one more fits within MAX_CHAT_HISTORY"""
+    excess = len(chat_history) - 2 * (MAX_CHAT_HISTORY - 1)
+    if excess > 0:
+        del chat_history[:excess + excess % 2]
+
+def _add_turn(chat_history: list, message: str, reply: str = "") -> dict:
+    """Append a user/assistant turn and return the assistant message"""
+    chat_history.append({"role": "user", "content": message})
+    chat_history.append({"role": "assistant", "content": reply})
+    return chat_history[-1]
+
+def chat_with_spider(message: str, chat_history: list):
+    """Process user message, streaming the reply into the chat history"""
+    if not message or not message.strip():
+        yield "", chat_history
+        return
+    
+    _trim_history(chat_history)
+    
+    if len(message) > MAX_MESSAGE_LENGTH:
+        _add_turn(chat_history, message, TOO_LONG_MESSAGE)
+        yield "", chat_history
+        return
+    
+    # Safety check (short, trigger-free messages skip the full scan)
+    if is_trivially_safe(message):
+        is_safe, safety_message = True, ""
+    else:
+        is_safe, safety_message = check_safety(message)
+    if not is_safe:
+        _add_turn(chat_history, message, safety_message)
+        yield "", chat_history
+        return
+    
+    # Show the user's message straight away, before engine init and the first token
+    reply = _add_turn(chat_history, message)
+    yield "", chat_history
+    
+    try:
+        # Get AI engine
+        ai = get_ai_engine()
+        
+        # Stream AI response into the assistant message, coalescing chunks
+        # so Gradio sends one update per STREAM_FLUSH_INTERVAL, not per token
+        parts = []
+        last_flush = time.monotonic()
+        for text in ai.stream_chat(message):
+            parts.append(text)
+            now = time.monotonic()
+            if now - last_flush >= STREAM_FLUSH_INTERVAL:
+                reply["content"] += "".join(parts)
+                parts.clear()
+                last_flush = now
+                yield "", chat_history
+        
+        reply["content"] += "".join(parts)
+        yield "", chat_history
+    
+    except Exception as e:
+        reply["content"] = f"❌ Error: {str(e)}"
+        yield "", chat_history
+
+def demo_chat(message: str, chat_history: list) -> tuple[str, list]:
+    """Placeholder chat used when the AI engine cannot be loaded"""
+    if not message or not message.strip():
+        return "", chat_history
+    
+    _trim_history(chat_history)
+    response = f"Demo Response to: {message}\n\nFor full functionality, please ensure all modules are installed."
+    _add_turn(chat_history, message, response)
+    return "", chat_history
+
+# ============================================================================
+# Knowledge Base Functions
+# ============================================================================
+
+FLASHCARD_TEMPLATE = """
+### 🎴 Flashcard
+
+**Question:** {question}
+
+**Answer:** {answer}
+
+**Category:** {category} | **Difficulty:** {difficulty}
+"""
+
+def get_random_flashcard() -> str:
+    """Get a random flashcard"""
+    cards = knowledge_base.get_flashcards(count=1)
+    if cards:
+        card = cards[0]
+        return FLASHCARD_TEMPLATE.format(
+            question=card.question,
+            answer=card.answer,
+            category=card.category,
+            difficulty=card.difficulty
+        )
+    return "No flashcards available"
+
+# The generated quiz lives in the caller's gr.State (one per browser session),
+# so "Show Answers" reveals the answers to the quiz that user is looking at
+
+def get_quiz_questions(num_questions: int = 5) -> Tuple[str, List[Dict]]:
+    """
+    Get quiz questions
+    
+    Returns:
+        Tuple of (formatted questions, quiz to keep in session state)
+    """
+    quiz = knowledge_base.get_quiz(count=int(num_questions))
+    return knowledge_base.format_quiz(quiz, show_answers=False), quiz
+
+def get_quiz_answers(quiz: Optional[List[Dict]]) -> str:
+    """Get answers for the session's current quiz"""
+    if not quiz:
+        return "Generate a quiz first, then reveal its answers."
+    return knowledge_base.format_quiz(quiz, show_answers=True)
+
+def search_mitre(tech_id: str) -> str:
+    """Search MITRE ATT&CK technique"""
+    if not tech_id:
+        return "Please enter a technique ID (e.g., T1566)"
+    
+    query = tech_id.strip()
+    normalized = normalize_technique_id(query)
+    if normalized:
+        tech_id = normalized
+        tech = knowledge_base.get_mitre_technique(tech_id)
+        if tech:
+            return knowledge_base.format_mitre_technique(tech)
+        query = tech_id[1:]
+    else:
+        tech_id = query
+    
+    # Try searching
+    results = knowledge_base.search_mitre(query)
+    if results:
+        parts = [f"Found {len(results)} techniques:\n"]
+        parts.extend(f"• **{t.technique_id}: {t.name}**" for t in results)
+        return "\n".join(parts) + "\n"
+    
+    return f"❌ Technique '{tech_id}' not found"
+
+@lru_cache(maxsize=8)
+def get_incident_template() -> str:
+    """Get incident report template"""
+    return knowledge_base.get_incident_template()
+
+@lru_cache(maxsize=8)
+def get_vuln_template() -> str:
+    """Get vulnerability report template"""
+    return knowledge_base.get_vulnerability_template()
+
+@lru_cache(maxsize=8)
+def get_hardening_checklist(system_type: str = "general") -> str:
+    """Get hardening checklist"""
+    return knowledge_base.get_hardening_checklist(system_type.lower())
@@ -5,23 +5,80 @@ Main Application Entry Point
 """
 
 import sys
-from typing import Optional
+import time
+import threading
+from typing import Optional, TYPE_CHECKING
 from rich.console import Console
 from rich.panel import Panel
 from rich.markdown import Markdown
+from rich.live import Live
 from rich.prompt import Prompt
 
+# Optional: line editing and history at the prompt (speech runs on its own
+# worker thread, so a blocking prompt doesn't hold it up)
+try:
+    from prompt_toolkit import PromptSession
+    from prompt_toolkit.formatted_text import HTML
+    PROMPT_TOOLKIT_AVAILABLE = True
+except ImportError:
+    PROMPT_TOOLKIT_AVAILABLE = False
+
 # Import configuration
 from config import settings, SYSTEM_PROMPT
 
 # Import modules
-from modules.voice import VoiceManager
 from modules.ai_engine import AIEngine
-from modules.safety import check_safety, safety_filter
+from modules.safety import check_safety, is_trivially_safe, safety_filter
 from modules.knowledge_base import knowledge_base
 
+if TYPE_CHECKING:
+    from modules.voice import VoiceManager
+
 console = Console()
 
+# Streamed replies are re-rendered at most this often
+LIVE_REFRESH_PER_SECOND = 12
+
+# Only the opening sentences of a reply are read aloud
+SPOKEN_SENTENCES = 2
+
+BANNER = """
+    🕷️ SPIDER - Cybersecurity Tutor
+    ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+    Your friendly voice-enabled
+    cybersecurity learning companion
+
+    Created by: Dhamodharaprashad (Project)
+"""
+
+HELP_TEXT = """
+## 📚 Quick Commands
+
+| Command | Description |
+|---------|-------------|
+| `help` | Show this help message |
+| `voice` | Toggle voice input mode |
+| `quiz` | Start a quick quiz |
+| `flashcard` | Get a random flashcard |
+| `mitre <id>` | Look up MITRE ATT&CK technique |
+| `template incident` | Get incident report template |
+| `template vuln` | Get vulnerability report template |
+| `checklist <type>` | Get hardening checklist |
+| `clear` | Clear conversation history |
+| `exit` | Exit Spider |
+
+## 💡 Example Questions
+- "Explain the NIST Cybersecurity Framework"
+- "How do I harden a Linux server?"
+- "What's the difference between IDS and IPS?"
+- "Help me prepare for Security+"
+- "What is T1566 in MITRE ATT&CK?"
+"""
+
+# Rendered once; the help command just reprints these
+BANNER_PANEL = Panel(BANNER, style="cyan")
+HELP_MARKDOWN = Markdown(HELP_TEXT)
+
 
 class Spider:
     """Main Spider Application"""
@@ -32,20 +89,30 @@ class Spider:
         self.ai: Optional[AIEngine] = None
         self.running = False
         
+        # Command dispatch: exact matches first, then argument-taking prefixes
+        self._exact_commands = {
+            "help": self._cmd_help,
+            "voice": self._cmd_voice,
+            "quiz": self._cmd_quiz,
+            "show answers": self._cmd_show_answers,
+            "flashcard": self._cmd_flashcard,
+            "clear": self._cmd_clear,
+            "exit": self._cmd_exit,
+            "quit": self._cmd_exit,
+            "bye": self._cmd_exit,
+        }
+        self._prefix_commands = (
+            ("mitre ", self._cmd_mitre),
+            ("template ", self._cmd_template),
+            ("checklist", self._cmd_checklist),
+        )
+        
         self._display_banner()
         self._initialize()
     
     def _display_banner(self):
         """Display welcome banner"""
-        banner = """
-    🕷️ SPIDER - Cybersecurity Tutor
-    ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-    Your friendly voice-enabled
-    cybersecurity learning companion
-
-    Created by: Dhamodharaprashad (Project)
-        """
-        self.console.print(Panel(banner, style="cyan"))
+        self.console.print(BANNER_PANEL)
     
     def _initialize(self):
         """Initialize all components"""
@@ -53,6 +120,9 @@ class Spider:
         
         # Initialize Voice
         if settings.voice_enabled:
+            # Imported here: the speech libraries are slow to load and unused
+            # when voice is off
+            from modules.voice import VoiceManager
             self.voice = VoiceManager(
                 voice_enabled=True,
                 tts_engine=settings.tts_engine,
@@ -78,170 +148,189 @@ class Spider:
             system_prompt=SYSTEM_PROMPT
         )
         
+        # Load a local model in the background while the user reads the help
+        threading.Thread(target=self.ai.warmup, daemon=True).start()
+        
         self.console.print("\n[bold green]✅ Spider is ready![/bold green]\n")
         self._show_help()
     
     def _show_help(self):
         """Display help information"""
-        help_text = """
-## 📚 Quick Commands
-
-| Command | Description |
-|---------|-------------|
-| `help` | Show this help message |
-| `voice` | Toggle voice input mode |
-| `quiz` | Start a quick quiz |
-| `flashcard` | Get a random flashcard |
-| `mitre <id>` | Look up MITRE ATT&CK technique |
-| `template incident` | Get incident report template |
-| `template vuln` | Get vulnerability report template |
-| `checklist <type>` | Get hardening checklist |
-| `clear` | Clear conversation history |
-| `exit` | Exit Spider |
-
-## 💡 Example Questions
-- "Explain the NIST Cybersecurity Framework"
-- "How do I harden a Linux server?"
-- "What's the difference between IDS and IPS?"
-- "Help me prepare for Security+"
-- "What is T1566 in MITRE ATT&CK?"
-        """
-        self.console.print(Markdown(help_text))
+        self.console.print(HELP_MARKDOWN)
     
     def process_command(self, user_input: str) -> Optional[str]:
         """Process special commands"""
         cmd = user_input.lower().strip()
         
-        if cmd == "help":
-            self._show_help()
-            return None
-        
-        elif cmd == "voice":
-            if self.voice and self.voice.is_available():
-                self.console.print("[cyan]🎤 Voice mode - listening...[/cyan]")
-                text = self.voice.listen(timeout=10)
-                if text:
-                    self.console.print(f"[green]You said:[/green] {text}")
-                    return text
-                return None
-            else:
-                self.console.print("[yellow]Voice not available[/yellow]")
-                return None
-        
-        elif cmd == "quiz":
-            quiz = knowledge_base.get_quiz(count=5)
-            output = knowledge_base.format_quiz(quiz, show_answers=False)
-            self.console.print(Markdown(output))
-            
-            # Store quiz for answer reveal
-            self._current_quiz = quiz
-            return None
+        handler = self._exact_commands.get(cmd)
+        if handler:
+            return handler(user_input)
         
-        elif cmd == "show answers" and hasattr(self, '_current_quiz'):
-            output = knowledge_base.format_quiz(self._current_quiz, show_answers=True)
-            self.console.print(Markdown(output))
-            return None
+        for prefix, handler in self._prefix_commands:
+            if cmd.startswith(prefix):
+                return handler(cmd)
         
-        elif cmd == "flashcard":
-            cards = knowledge_base.get_flashcards(count=1)
-            if cards:
-                card = cards[0]
-                self.console.print(Panel(
-                    f"[bold cyan]Q:[/bold cyan] {card.question}\n\n"
-                    f"[bold green]A:[/bold green] {card.answer}\n\n"
-                    f"[dim]Category: {card.category} | Difficulty: {card.difficulty}[/dim]",
-                    title="🎴 Flashcard"
-                ))
+        # Not a command, return input for AI processing
+        return user_input
+    
+    # Command handlers return None when handled, or text to send to the AI
+    
+    def _cmd_help(self, user_input: str) -> Optional[str]:
+        self._show_help()
+        return None
+    
+    def _cmd_voice(self, user_input: str) -> Optional[str]:
+        if self.voice and self.voice.is_available():
+            self.console.print("[cyan]🎤 Voice mode - listening...[/cyan]")
+            text = self.voice.listen(timeout=10)
+            if text:
+                self.console.print(f"[green]You said:[/green] {text}")
+                return text
             return None
-        
-        elif cmd.startswith("mitre "):
-            tech_id = cmd.replace("mitre ", "").strip().upper()
-            if not tech_id.startswith("T"):
-                tech_id = "T" + tech_id
-            
-            tech = knowledge_base.get_mitre_technique(tech_id)
-            if tech:
-                output = knowledge_base.format_mitre_technique(tech)
-                self.console.print(Markdown(output))
-            else:
-                # Search instead
-                results = knowledge_base.search_mitre(tech_id.replace("T", ""))
-                if results:
-                    self.console.print(f"Found {len(results)} techniques:")
-                    for t in results:
-                        self.console.print(f"  • {t.technique_id}: {t.name}")
-                else:
-                    self.console.print("[yellow]Technique not found. Try searching by keyword.[/yellow]")
+        else:
+            self.console.print("[yellow]Voice not available[/yellow]")
             return None
+    
+    def _cmd_quiz(self, user_input: str) -> Optional[str]:
+        quiz = knowledge_base.get_quiz(count=5)
+        output = knowledge_base.format_quiz(quiz, show_answers=False)
+        self.console.print(Markdown(output))
         
-        elif cmd.startswith("template "):
-            template_type = cmd.replace("template ", "").strip()
-            if "incident" in template_type:
-                self.console.print(Markdown(knowledge_base.get_incident_template()))
-            elif "vuln" in template_type:
-                self.console.print(Markdown(knowledge_base.get_vulnerability_template()))
-            else:
-                self.console.print("[yellow]Available: template incident, template vuln[/yellow]")
-            return None
+        # Store quiz for answer reveal
+        self._current_quiz = quiz
+        return None
+    
+    def _cmd_show_answers(self, user_input: str) -> Optional[str]:
+        if not hasattr(self, '_current_quiz'):
+            return user_input
+        output = knowledge_base.format_quiz(self._current_quiz, show_answers=True)
+        self.console.print(Markdown(output))
+        return None
+    
+    def _cmd_flashcard(self, user_input: str) -> Optional[str]:
+        cards = knowledge_base.get_flashcards(count=1)
+        if cards:
+            card = cards[0]
+            self.console.print(Panel(
+                f"[bold cyan]Q:[/bold cyan] {card.question}\n\n"
+                f"[bold green]A:[/bold green] {card.answer}\n\n"
+                f"[dim]Category: {card.category} | Difficulty: {card.difficulty}[/dim]",
+                title="🎴 Flashcard"
+            ))
+        return None
+    
+    def _cmd_mitre(self, cmd: str) -> Optional[str]:
+        tech_id = cmd.replace("mitre ", "").strip().upper()
+        if not tech_id.startswith("T"):
+            tech_id = "T" + tech_id
         
-        elif cmd.startswith("checklist"):
-            parts = cmd.split()
-            sys_type = parts[1] if len(parts) > 1 else "general"
-            output = knowledge_base.get_hardening_checklist(sys_type)
+        tech = knowledge_base.get_mitre_technique(tech_id)
+        if tech:
+            output = knowledge_base.format_mitre_technique(tech)
             self.console.print(Markdown(output))
-            return None
-        
-        elif cmd == "clear":
-            self.ai.reset_conversation()
-            return None
-        
-        elif cmd in ["exit", "quit", "bye"]:
-            self.running = False
-            self.console.print("\n[cyan]👋 Goodbye! Stay secure![/cyan]\n")
-            return None
-        
-        # Not a command, return input for AI processing
-        return user_input
+        else:
+            # Search instead
+            results = knowledge_base.search_mitre(tech_id.replace("T", ""))
+            if results:
+                self.console.print(f"Found {len(results)} techniques:")
+                for t in results:
+                    self.console.print(f"  • {t.technique_id}: {t.name}")
+            else:
+                self.console.print("[yellow]Technique not found. Try searching by keyword.[/yellow]")
+        return None
+    
+    def _cmd_template(self, cmd: str) -> Optional[str]:
+        template_type = cmd.replace("template ", "").strip()
+        if "incident" in template_type:
+            self.console.print(Markdown(knowledge_base.get_incident_template()))
+        elif "vuln" in template_type:
+            self.console.print(Markdown(knowledge_base.get_vulnerability_template()))
+        else:
+            self.console.print("[yellow]Available: template incident, template vuln[/yellow]")
+        return None
+    
+    def _cmd_checklist(self, cmd: str) -> Optional[str]:
+        parts = cmd.split()
+        sys_type = parts[1] if len(parts) > 1 else "general"
+        output = knowledge_base.get_hardening_checklist(sys_type)
+        self.console.print(Markdown(output))
+        return None
+    
+    def _cmd_clear(self, user_input: str) -> Optional[str]:
+        self.ai.reset_conversation()
+        return None
+    
+    def _cmd_exit(self, user_input: str) -> Optional[str]:
+        self.running = False
+        self.console.print("\n[cyan]👋 Goodbye! Stay secure![/cyan]\n")
+        return None
     
     def chat(self, user_input: str):
         """Process a chat message"""
-        # Safety check
-        is_safe, safety_message = check_safety(user_input)
+        # Safety check - short messages with no trigger words skip the full scan
+        if is_trivially_safe(user_input):
+            is_safe, safety_message = True, ""
+        else:
+            is_safe, safety_message = check_safety(user_input)
         if not is_safe:
             self.console.print(Markdown(safety_message))
             if self.voice:
-                self.voice.speak("I can't help with that request, but I can offer safe alternatives.")
+                self.voice.speak("I can't help with that request, but I can offer safe alternatives.", block=False)
             return
         
         # Get AI response
         self.console.print("[dim]Thinking...[/dim]")
         
         try:
-            response = self.ai.chat(user_input, stream=True)
-            
-            # Display response
+            # Display response as it streams; Markdown re-parses the whole
+            # text, so only rebuild it at the Live refresh rate
             self.console.print()
-            self.console.print(Markdown(response))
+            response = ""
+            last_update = 0.0
+            spoken, spoken_upto = 0, 0
+            with Live(Markdown(""), console=self.console,
+                      refresh_per_second=LIVE_REFRESH_PER_SECOND) as live:
+                for chunk in self.ai.stream_chat(user_input):
+                    response += chunk
+                    now = time.monotonic()
+                    if now - last_update >= 1 / LIVE_REFRESH_PER_SECOND:
+                        live.update(Markdown(response))
+                        last_update = now
+                    
+                    # Start speaking each summary sentence as soon as it completes
+                    while self.voice and spoken < SPOKEN_SENTENCES:
+                        end = response.find('. ', spoken_upto)
+                        if end == -1:
+                            break
+                        self.voice.speak(response[spoken_upto:end + 1], block=False)
+                        spoken, spoken_upto = spoken + 1, end + 2
+                live.update(Markdown(response))
             
-            # Speak summary (first 2 sentences)
             if self.voice:
-                sentences = response.split('. ')[:2]
-                summary = '. '.join(sentences)
-                self.voice.speak(summary, block=False)
+                # A short reply may end without a trailing '. '
+                if spoken < SPOKEN_SENTENCES and response[spoken_upto:].strip():
+                    self.voice.speak(response[spoken_upto:], block=False)
                 
         except Exception as e:
             self.console.print(f"[red]Error: {e}[/red]")
     
+    def _read_input(self, session) -> str:
+        """Read a line from the user"""
+        if session:
+            return session.prompt(HTML("\n<ansigreen><b>You</b></ansigreen>: "))
+        return Prompt.ask("\n[bold green]You[/bold green]")
+    
     def run(self):
-        """Main application loop"""
+        """Main application loop (synchronous, so Ctrl-C interrupts a streaming reply)"""
         self.running = True
+        session = PromptSession() if PROMPT_TOOLKIT_AVAILABLE else None
         
         self.console.print("\n[bold cyan]🕷️ Spider is ready! Type your question or 'help' for commands.[/bold cyan]\n")
         
         while self.running:
             try:
                 # Get user input
-                user_input = Prompt.ask("\n[bold green]You[/bold green]")
+                user_input = self._read_input(session)
                 
                 if not user_input.strip():
                     continue
@@ -255,10 +344,16 @@ class Spider:
                     
             except KeyboardInterrupt:
                 self.console.print("\n[cyan]Use 'exit' to quit properly.[/cyan]")
+            except EOFError:
+                self.running = False
             except Exception as e:
                 self.console.print(f"[red]Error: {e}[/red]")
         
-        # Cleanup
+        # Cleanup: speech is fire-and-forget per turn, so let the last
+        # reply finish before the daemon speech worker dies with the process
+        if self.voice:
+            self.voice.close()
+            self.voice.flush()
         if self.voice and self.voice.output:
             self.voice.output.stop()
 
@@ -3,66 +3,222 @@ Spider Cybersecurity Tutor - AI Engine
 Handles LLM integration for generating responses
 """
 
-from typing import Optional, List, Dict, Generator
+import importlib.util
+import re
+import sys
+import time
+import threading
+from collections import OrderedDict, deque
+from typing import Optional, List, Dict, Deque, Generator, AsyncGenerator
 from dataclasses import dataclass, field
 from rich.console import Console
 import json
 
 console = Console()
 
-# Import LLM libraries
-try:
-    import openai
-    OPENAI_AVAILABLE = True
-except ImportError:
-    OPENAI_AVAILABLE = False
+# Check which LLM libraries are installed without importing them; each SDK
+# is slow to import, so only the configured provider's is loaded
+OPENAI_AVAILABLE = importlib.util.find_spec("openai") is not None
+ANTHROPIC_AVAILABLE = importlib.util.find_spec("anthropic") is not None
+OLLAMA_AVAILABLE = importlib.util.find_spec("ollama") is not None
 
-try:
-    import anthropic
-    ANTHROPIC_AVAILABLE = True
-except ImportError:
-    ANTHROPIC_AVAILABLE = False
+# One keep-alive connection pool shared by every hosted-provider client, so
+# new AIEngine instances don't pay a fresh TCP+TLS handshake. The async SDK
+# clients (used by the FastAPI backend) get their own pool with the same limits
+_shared_http = None
+_shared_async_http = None
+_shared_http_lock = threading.Lock()
 
-try:
-    import ollama
-    OLLAMA_AVAILABLE = True
-except ImportError:
-    OLLAMA_AVAILABLE = False
 
+def _http_limits():
+    """Connection pool limits for the shared httpx clients"""
+    import httpx
+    return httpx.Limits(max_keepalive_connections=16, max_connections=32, keepalive_expiry=60.0)
 
-@dataclass
+
+def _get_shared_http():
+    """Return the shared httpx client, creating it on first use"""
+    global _shared_http
+    if _shared_http is None:
+        with _shared_http_lock:
+            if _shared_http is None:
+                import httpx
+                _shared_http = httpx.Client(limits=_http_limits())
+    return _shared_http
+
+
+def _get_shared_async_http():
+    """Return the shared httpx.AsyncClient, creating it on first use"""
+    global _shared_async_http
+    if _shared_async_http is None:
+        with _shared_http_lock:
+            if _shared_async_http is None:
+                import httpx
+                _shared_async_http = httpx.AsyncClient(limits=_http_limits())
+    return _shared_async_http
+
+# Keep the local model (and its cached system-prompt prefix) loaded between turns
+OLLAMA_KEEP_ALIVE = "30m"
+
+# Minimum seconds between prefetches while the user is typing (below the
+# shared pool's 60s keep-alive expiry)
+PREFETCH_INTERVAL = 30.0
+
+# Anthropic prompt caching (beta in the pinned SDK)
+ANTHROPIC_PROMPT_CACHE_HEADERS = {"anthropic-beta": "prompt-caching-2024-07-31"}
+EPHEMERAL_CACHE = {"type": "ephemeral"}
+
+
+@dataclass(slots=True)
 class Message:
     """Represents a chat message"""
     role: str  # 'user', 'assistant', 'system'
     content: str
+    tokens: int = 0
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token for English text)"""
+    return len(text) // 4 + 1
 
 
 @dataclass
 class Conversation:
     """Manages conversation history"""
-    messages: List[Message] = field(default_factory=list)
+    system_messages: List[Message] = field(default_factory=list)
+    other_messages: Deque[Message] = field(init=False)
     max_history: int = 20
+    max_tokens_history: int = 8000
+    
+    def __post_init__(self):
+        # The deque drops the oldest turn itself once max_history is reached
+        self.other_messages = deque(maxlen=self._other_limit())
+        # API-format dicts, built once per message and trimmed in step:
+        # system messages first, then the turns in other_messages
+        self._api_messages: List[Dict] = [self._to_api(m) for m in self.system_messages]
+        self._other_tokens = 0
+    
+    @staticmethod
+    def _to_api(message: Message) -> Dict:
+        return {"role": message.role, "content": message.content}
+    
+    def _other_limit(self) -> int:
+        # Always keep at least the newest turn; a maxlen=0 deque would drop
+        # every message while _api_messages kept growing
+        return max(self.max_history - len(self.system_messages), 1)
+    
+    @property
+    def api_messages(self) -> List[Dict]:
+        """
+        The canonical API-format message list, passed to the SDKs as-is
+        
+        Callers must not modify it; use get_messages_for_api() for a copy.
+        """
+        return self._api_messages
+    
+    @property
+    def messages(self) -> List[Message]:
+        """All messages, system prompt first"""
+        return [*self.system_messages, *self.other_messages]
     
     def add_message(self, role: str, content: str):
         """Add a message to the conversation"""
-        self.messages.append(Message(role=role, content=content))
+        message = Message(role=role, content=content, tokens=estimate_tokens(content))
+        if role == 'system':
+            self._api_messages.insert(len(self.system_messages), self._to_api(message))
+            self.system_messages.append(message)
+            # Keep the history limit counting system messages
+            self.other_messages = deque(self.other_messages, maxlen=self._other_limit())
+            del self._api_messages[len(self.system_messages):-len(self.other_messages) or None]
+            self._other_tokens = sum(m.tokens for m in self.other_messages)
+            return
+        
+        trimmed = len(self.other_messages) == self.other_messages.maxlen
+        if trimmed and self.other_messages:
+            # The deque is about to drop its oldest message
+            self._other_tokens -= self.other_messages[0].tokens
+            del self._api_messages[len(self.system_messages)]
+        self.other_messages.append(message)
+        self._api_messages.append(self._to_api(message))
+        self._other_tokens += message.tokens
         
-        # Trim history if too long (keep system message)
-        if len(self.messages) > self.max_history:
-            system_msgs = [m for m in self.messages if m.role == 'system']
-            other_msgs = [m for m in self.messages if m.role != 'system']
-            self.messages = system_msgs + other_msgs[-(self.max_history - len(system_msgs)):]
+        # Then trim to the token budget, always keeping the newest message
+        while self._other_tokens > self.max_tokens_history and len(self.other_messages) > 1:
+            self._pop_oldest()
+            trimmed = True
+        # History sent to the API should start on a user turn
+        if trimmed:
+            while len(self.other_messages) > 1 and self.other_messages[0].role != 'user':
+                self._pop_oldest()
+    
+    def _pop_oldest(self):
+        self._other_tokens -= self.other_messages.popleft().tokens
+        del self._api_messages[len(self.system_messages)]
+    
+    def has_history(self) -> bool:
+        """True once any user/assistant turn has been added"""
+        return bool(self.other_messages)
     
     def get_messages_for_api(self) -> List[Dict]:
         """Convert messages to API format"""
-        return [{"role": m.role, "content": m.content} for m in self.messages]
+        return list(self._api_messages)
+    
+    def get_messages_for_api_no_system(self) -> List[Dict]:
+        """API-format messages without the system prompt (Anthropic)"""
+        return self._api_messages[len(self.system_messages):]
     
     def clear(self, keep_system: bool = True):
         """Clear conversation history"""
-        if keep_system:
-            self.messages = [m for m in self.messages if m.role == 'system']
-        else:
-            self.messages = []
+        self.other_messages.clear()
+        del self._api_messages[len(self.system_messages):]
+        self._other_tokens = 0
+        if not keep_system:
+            self.system_messages = []
+            self._api_messages = []
+            self.other_messages = deque(maxlen=self._other_limit())
+
+
+class ResponseCache:
+    """
+    LRU cache of replies to opening questions
+    
+    Only questions asked with no prior turns are cached, since their reply
+    doesn't depend on conversation context. Keys ignore case, punctuation
+    and spacing, so "What is the CIA triad?" and "what is the cia triad"
+    share an entry.
+    """
+    
+    _NON_WORD = re.compile(r'[^\w]+')
+    
+    def __init__(self, max_size: int = 256):
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    @classmethod
+    def normalize(cls, text: str) -> str:
+        """Reduce text to a lookup key"""
+        return " ".join(cls._NON_WORD.sub(" ", text.lower()).split())
+    
+    def get(self, text: str) -> Optional[str]:
+        """Return the cached reply for text, if any"""
+        key = self.normalize(text)
+        with self._lock:
+            response = self._entries.get(key)
+            if response is not None:
+                self._entries.move_to_end(key)
+            return response
+    
+    def put(self, text: str, response: str):
+        """Store a reply, evicting the least recently used entry when full"""
+        if self.max_size <= 0 or not response or response.startswith("❌"):
+            return
+        key = self.normalize(text)
+        with self._lock:
+            self._entries[key] = response
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
 
 
 class AIEngine:
@@ -74,19 +230,35 @@ class AIEngine:
                  model: str = "gpt-4o-mini",
                  max_tokens: int = 2048,
                  temperature: float = 0.7,
-                 system_prompt: str = ""):
+                 system_prompt: str = "",
+                 enable_prompt_cache: bool = True,
+                 response_cache_size: int = 256,
+                 stream_batch_size: int = 16,
+                 stream_flush_ms: float = 50):
         
         self.provider = provider.lower()
         self.model = model
         self.max_tokens = max_tokens
         self.temperature = temperature
         self.system_prompt = system_prompt
+        self.enable_prompt_cache = enable_prompt_cache
+        self.response_cache = ResponseCache(max_size=response_cache_size)
+        self.stream_batch_size = stream_batch_size
+        self.stream_flush_ms = stream_flush_ms
         self.conversation = Conversation()
         self.client = None
+        self.aclient = None
+        self._last_prefetch = 0.0
+        self._prefetch_lock = threading.Lock()
         
         # Initialize the appropriate client
         self._init_client(api_key)
         
+        # Open the provider connection in the background so the first chat
+        # reuses a warm socket
+        if self.client and self.provider in ("openai", "anthropic"):
+            threading.Thread(target=self._prewarm_connection, daemon=True).start()
+        
         # Add system prompt to conversation
         if system_prompt:
             self.conversation.add_message("system", system_prompt)
@@ -98,20 +270,26 @@ class AIEngine:
                 if not api_key:
                     console.print("[red]❌ OpenAI API key required[/red]")
                     return
-                self.client = openai.OpenAI(api_key=api_key)
+                import openai
+                self.client = openai.OpenAI(api_key=api_key, http_client=_get_shared_http())
+                self.aclient = openai.AsyncOpenAI(api_key=api_key, http_client=_get_shared_async_http())
                 console.print(f"[green]🤖 OpenAI client initialized (model: {self.model})[/green]")
                 
             elif self.provider == "anthropic" and ANTHROPIC_AVAILABLE:
                 if not api_key:
                     console.print("[red]❌ Anthropic API key required[/red]")
                     return
-                self.client = anthropic.Anthropic(api_key=api_key)
+                import anthropic
+                self.client = anthropic.Anthropic(api_key=api_key, http_client=_get_shared_http())
+                self.aclient = anthropic.AsyncAnthropic(api_key=api_key, http_client=_get_shared_async_http())
                 self.model = "claude-3-haiku-20240307" if "haiku" in self.model.lower() else "claude-3-5-sonnet-20241022"
                 console.print(f"[green]🤖 Anthropic client initialized (model: {self.model})[/green]")
                 
             elif self.provider == "ollama" and OLLAMA_AVAILABLE:
                 # Ollama runs locally, no API key needed
+                import ollama
                 self.client = ollama
+                self.aclient = ollama.AsyncClient()
                 self.model = self.model or "llama3.2"
                 console.print(f"[green]🤖 Ollama client initialized (model: {self.model})[/green]")
                 
@@ -135,6 +313,14 @@ class AIEngine:
         if not self.client:
             return "❌ AI engine not initialized. Please check your API key and provider settings."
         
+        opening = not self.conversation.has_history()
+        if opening:
+            cached = self.response_cache.get(user_message)
+            if cached is not None:
+                self.conversation.add_message("user", user_message)
+                self.conversation.add_message("assistant", cached)
+                return cached
+        
         # Add user message to conversation
         self.conversation.add_message("user", user_message)
         
@@ -150,6 +336,8 @@ class AIEngine:
             
             # Add assistant response to conversation
             self.conversation.add_message("assistant", response)
+            if opening:
+                self.response_cache.put(user_message, response)
             return response
             
         except Exception as e:
@@ -157,27 +345,244 @@ class AIEngine:
             console.print(f"[red]{error_msg}[/red]")
             return error_msg
     
+    def stream_chat(self, user_message: str) -> Generator[str, None, None]:
+        """
+        Send a message and yield the response as it is generated
+        
+        Args:
+            user_message: User's input message
+            
+        Yields:
+            Chunks of the assistant's response
+        """
+        if not self.client:
+            yield "❌ AI engine not initialized. Please check your API key and provider settings."
+            return
+        
+        if self.provider == "openai":
+            chunks = self._stream_openai
+        elif self.provider == "anthropic":
+            chunks = self._stream_anthropic
+        elif self.provider == "ollama":
+            chunks = self._stream_ollama
+        else:
+            yield "❌ Unknown provider"
+            return
+        
+        opening = not self.conversation.has_history()
+        if opening:
+            cached = self.response_cache.get(user_message)
+            if cached is not None:
+                self.conversation.add_message("user", user_message)
+                self.conversation.add_message("assistant", cached)
+                yield cached
+                return
+        
+        # Add user message to conversation
+        self.conversation.add_message("user", user_message)
+        
+        parts = []
+        try:
+            for text in chunks():
+                parts.append(text)
+                yield text
+        except Exception as e:
+            error_msg = f"❌ Error generating response: {str(e)}"
+            console.print(f"[red]{error_msg}[/red]")
+            yield error_msg
+            return
+        
+        # Add assistant response to conversation
+        response = "".join(parts)
+        self.conversation.add_message("assistant", response)
+        if opening:
+            self.response_cache.put(user_message, response)
+    
+    def _stream_openai(self) -> Generator[str, None, None]:
+        """Yield response chunks from the OpenAI API"""
+        stream_response = self.client.chat.completions.create(
+            model=self.model,
+            messages=self.conversation.api_messages,
+            max_tokens=self.max_tokens,
+            temperature=self.temperature,
+            stream=True
+        )
+        for chunk in stream_response:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+    
+    def _anthropic_params(self) -> Dict:
+        """Build the system/messages arguments for an Anthropic request"""
+        # Anthropic handles system prompt separately
+        messages = self.conversation.get_messages_for_api_no_system()
+        if not self.enable_prompt_cache:
+            return {"system": self.system_prompt, "messages": messages}
+        
+        # Cache breakpoints on the system prompt and the latest user turn, so
+        # each request reads the prefix the previous turn wrote
+        last = messages[-1]
+        messages[-1] = {
+            "role": last["role"],
+            "content": [{"type": "text", "text": last["content"], "cache_control": EPHEMERAL_CACHE}]
+        }
+        system = self.system_prompt
+        if system:
+            system = [{"type": "text", "text": system, "cache_control": EPHEMERAL_CACHE}]
+        return {
+            "system": system,
+            "messages": messages,
+            "extra_headers": ANTHROPIC_PROMPT_CACHE_HEADERS
+        }
+    
+    def _stream_anthropic(self) -> Generator[str, None, None]:
+        """Yield response chunks from the Anthropic API"""
+        with self.client.messages.stream(
+            model=self.model,
+            max_tokens=self.max_tokens,
+            **self._anthropic_params()
+        ) as stream_response:
+            yield from stream_response.text_stream
+    
+    def _stream_ollama(self) -> Generator[str, None, None]:
+        """Yield response chunks from Ollama (local)"""
+        stream_response = self.client.chat(
+            model=self.model,
+            messages=self.conversation.api_messages,
+            stream=True,
+            keep_alive=OLLAMA_KEEP_ALIVE
+        )
+        for chunk in stream_response:
+            yield chunk['message']['content']
+    
+    async def achat(self, user_message: str) -> str:
+        """
+        Async version of chat(), for serving several sessions on one event loop
+        
+        Args:
+            user_message: User's input message
+            
+        Returns:
+            Assistant's response
+        """
+        return "".join([text async for text in self.astream_chat(user_message)])
+    
+    async def astream_chat(self, user_message: str) -> AsyncGenerator[str, None]:
+        """
+        Async version of stream_chat()
+        
+        Args:
+            user_message: User's input message
+            
+        Yields:
+            Chunks of the assistant's response
+        """
+        if not self.aclient:
+            yield "❌ AI engine not initialized. Please check your API key and provider settings."
+            return
+        
+        if self.provider == "openai":
+            chunks = self._astream_openai
+        elif self.provider == "anthropic":
+            chunks = self._astream_anthropic
+        elif self.provider == "ollama":
+            chunks = self._astream_ollama
+        else:
+            yield "❌ Unknown provider"
+            return
+        
+        opening = not self.conversation.has_history()
+        if opening:
+            cached = self.response_cache.get(user_message)
+            if cached is not None:
+                self.conversation.add_message("user", user_message)
+                self.conversation.add_message("assistant", cached)
+                yield cached
+                return
+        
+        # Add user message to conversation
+        self.conversation.add_message("user", user_message)
+        
+        parts = []
+        try:
+            async for text in chunks():
+                parts.append(text)
+                yield text
+        except Exception as e:
+            error_msg = f"❌ Error generating response: {str(e)}"
+            console.print(f"[red]{error_msg}[/red]")
+            yield error_msg
+            return
+        
+        # Add assistant response to conversation
+        response = "".join(parts)
+        self.conversation.add_message("assistant", response)
+        if opening:
+            self.response_cache.put(user_message, response)
+    
+    async def _astream_openai(self) -> AsyncGenerator[str, None]:
+        """Yield response chunks from the OpenAI API (async)"""
+        stream_response = await self.aclient.chat.completions.create(
+            model=self.model,
+            messages=self.conversation.api_messages,
+            max_tokens=self.max_tokens,
+            temperature=self.temperature,
+            stream=True
+        )
+        async for chunk in stream_response:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+    
+    async def _astream_anthropic(self) -> AsyncGenerator[str, None]:
+        """Yield response chunks from the Anthropic API (async)"""
+        async with self.aclient.messages.stream(
+            model=self.model,
+            max_tokens=self.max_tokens,
+            **self._anthropic_params()
+        ) as stream_response:
+            async for text in stream_response.text_stream:
+                yield text
+    
+    async def _astream_ollama(self) -> AsyncGenerator[str, None]:
+        """Yield response chunks from Ollama (local, async)"""
+        stream_response = await self.aclient.chat(
+            model=self.model,
+            messages=self.conversation.api_messages,
+            stream=True,
+            keep_alive=OLLAMA_KEEP_ALIVE
+        )
+        async for chunk in stream_response:
+            yield chunk['message']['content']
+    
+    def _print_stream(self, chunks) -> str:
+        """
+        Echo streamed chunks to stdout and return the full text
+        
+        Writes are batched (stream_batch_size chunks or stream_flush_ms,
+        whichever comes first) instead of flushing on every token.
+        """
+        parts = []
+        pending = []
+        flush_after = self.stream_flush_ms / 1000
+        last_flush = time.monotonic()
+        for content in chunks:
+            parts.append(content)
+            pending.append(content)
+            now = time.monotonic()
+            if len(pending) >= self.stream_batch_size or now - last_flush >= flush_after:
+                sys.stdout.write("".join(pending))
+                sys.stdout.flush()
+                pending.clear()
+                last_flush = now
+        sys.stdout.write("".join(pending) + "\n")  # Newline after streaming
+        sys.stdout.flush()
+        return "".join(parts)
+    
     def _chat_openai(self, stream: bool = False) -> str:
         """Chat using OpenAI API"""
-        messages = self.conversation.get_messages_for_api()
-        
         if stream:
-            response_text = ""
-            stream_response = self.client.chat.completions.create(
-                model=self.model,
-                messages=messages,
-                max_tokens=self.max_tokens,
-                temperature=self.temperature,
-                stream=True
-            )
-            for chunk in stream_response:
-                if chunk.choices[0].delta.content:
-                    content = chunk.choices[0].delta.content
-                    response_text += content
-                    print(content, end="", flush=True)
-            print()  # Newline after streaming
-            return response_text
+            return self._print_stream(self._stream_openai())
         else:
+            messages = self.conversation.api_messages
             response = self.client.chat.completions.create(
                 model=self.model,
                 messages=messages,
@@ -188,56 +593,101 @@ class AIEngine:
     
     def _chat_anthropic(self, stream: bool = False) -> str:
         """Chat using Anthropic API"""
-        # Anthropic handles system prompt separately
-        messages = [m for m in self.conversation.get_messages_for_api() if m['role'] != 'system']
-        system = self.system_prompt
-        
         if stream:
-            response_text = ""
-            with self.client.messages.stream(
-                model=self.model,
-                max_tokens=self.max_tokens,
-                system=system,
-                messages=messages
-            ) as stream_response:
-                for text in stream_response.text_stream:
-                    response_text += text
-                    print(text, end="", flush=True)
-            print()
-            return response_text
+            return self._print_stream(self._stream_anthropic())
         else:
             response = self.client.messages.create(
                 model=self.model,
                 max_tokens=self.max_tokens,
-                system=system,
-                messages=messages
+                **self._anthropic_params()
             )
             return response.content[0].text
     
     def _chat_ollama(self, stream: bool = False) -> str:
         """Chat using Ollama (local)"""
-        messages = self.conversation.get_messages_for_api()
-        
         if stream:
-            response_text = ""
-            stream_response = self.client.chat(
-                model=self.model,
-                messages=messages,
-                stream=True
-            )
-            for chunk in stream_response:
-                content = chunk['message']['content']
-                response_text += content
-                print(content, end="", flush=True)
-            print()
-            return response_text
+            return self._print_stream(self._stream_ollama())
         else:
+            messages = self.conversation.api_messages
             response = self.client.chat(
                 model=self.model,
-                messages=messages
+                messages=messages,
+                keep_alive=OLLAMA_KEEP_ALIVE
             )
             return response['message']['content']
     
+    def warmup(self, keep_alive: str = OLLAMA_KEEP_ALIVE, quiet: bool = False):
+        """
+        Get ready for the first real request
+        
+        Ollama loads the model into memory on first use, which can take tens
+        of seconds; a 1-token generation pulls it in and keep_alive pins it
+        there. For hosted providers this just opens a pooled connection so
+        the first chat skips the TLS handshake.
+        
+        Args:
+            keep_alive: How long Ollama should keep the model loaded
+            quiet: Don't print the Ollama warmup result
+        """
+        if not self.client:
+            return
+        
+        if self.provider in ("openai", "anthropic"):
+            self._prewarm_connection()
+            return
+        
+        if self.provider != "ollama":
+            return
+        
+        try:
+            self.client.generate(
+                model=self.model,
+                prompt="hi",
+                keep_alive=keep_alive,
+                options={"num_predict": 1}
+            )
+            if not quiet:
+                console.print(f"[green]🔥 Ollama model warmed up ({self.model})[/green]")
+        except Exception as e:
+            if not quiet:
+                console.print(f"[yellow]⚠️ Ollama warmup failed: {e}[/yellow]")
+    
+    def prefetch(self):
+        """
+        Get ready for a message the user is still typing
+        
+        Re-runs a quiet warmup at most once per PREFETCH_INTERVAL, so a
+        connection or model that went idle during think-time is ready again
+        by the time the message is sent.
+        """
+        now = time.monotonic()
+        with self._prefetch_lock:
+            if now - self._last_prefetch < PREFETCH_INTERVAL:
+                return
+            self._last_prefetch = now
+        self.warmup(quiet=True)
+    
+    def _prewarm_connection(self):
+        """Resolve DNS and open a pooled TLS connection to the provider API"""
+        try:
+            _get_shared_http().head(str(self.client.base_url))
+        except Exception:
+            pass
+    
+    async def awarmup(self):
+        """
+        Async counterpart of warmup() for hosted providers: opens a
+        connection in the async pool that achat()/astream_chat() use
+        
+        Must run on the event loop that will serve the chat requests.
+        """
+        if not self.aclient or self.provider not in ("openai", "anthropic"):
+            return
+        try:
+            await _get_shared_async_http().head(str(self.aclient.base_url))
+        except Exception:
+            pass
+    
     def reset_conversation(self):
         """Reset the conversation history"""
         self.conversation.clear(keep_system=True)
@@ -245,5 +695,5 @@ class AIEngine:
     
     def get_conversation_summary(self) -> str:
         """Get a summary of the current conversation"""
-        msg_count = len([m for m in self.conversation.messages if m.role != 'system'])
+        msg_count = len(self.conversation.other_messages)
         return f"Conversation: {msg_count} messages"
\ No newline at end of file
@@ -7,9 +7,10 @@ from typing import Dict, List, Optional
 from dataclasses import dataclass
 import json
 import random
+import re
 
 
-@dataclass
+@dataclass(slots=True)
 class Flashcard:
     """A study flashcard"""
     question: str
@@ -19,7 +20,7 @@ class Flashcard:
     cert_relevance: List[str]  # Security+, CySA+, CISSP, etc.
 
 
-@dataclass
+@dataclass(slots=True)
 class MitreAttackTechnique:
     """MITRE ATT&CK technique reference"""
     technique_id: str
@@ -284,117 +285,9 @@ VULNERABILITY_REPORT_TEMPLATE = """
 """
 
 
-class KnowledgeBase:
-    """Manages cybersecurity knowledge and resources"""
-    
-    def __init__(self):
-        self.flashcards = FLASHCARDS
-        self.mitre_techniques = MITRE_TECHNIQUES
-    
-    def get_flashcards(self, 
-                       category: Optional[str] = None,
-                       difficulty: Optional[str] = None,
-                       cert: Optional[str] = None,
-                       count: int = 5) -> List[Flashcard]:
-        """Get flashcards matching criteria"""
-        cards = self.flashcards
-        
-        if category:
-            cards = [c for c in cards if category.lower() in c.category.lower()]
-        if difficulty:
-            cards = [c for c in cards if c.difficulty == difficulty.lower()]
-        if cert:
-            cards = [c for c in cards if any(cert.upper() in cr.upper() for cr in c.cert_relevance)]
-        
-        # Shuffle and return requested count
-        random.shuffle(cards)
-        return cards[:count]
-    
-    def get_quiz(self, 
-                 category: Optional[str] = None,
-                 count: int = 5) -> List[Dict]:
-        """Generate a quiz from flashcards"""
-        cards = self.get_flashcards(category=category, count=count)
-        quiz = []
-        
-        for i, card in enumerate(cards, 1):
-            quiz.append({
-                "number": i,
-                "question": card.question,
-                "answer": card.answer,
-                "category": card.category,
-                "difficulty": card.difficulty
-            })
-        
-        return quiz
-    
-    def format_quiz(self, quiz: List[Dict], show_answers: bool = False) -> str:
-        """Format quiz for display"""
-        output = "# 🎯 Cybersecurity Quiz\n\n"
-        
-        for q in quiz:
-            output += f"**Q{q['number']}** [{q['category']}] ({q['difficulty']})\n"
-            output += f"{q['question']}\n\n"
-            
-            if show_answers:
-                output += f"**Answer:** {q['answer']}\n\n"
-                output += "---\n\n"
-        
-        if not show_answers:
-            output += "\n*Say 'show answers' to reveal the answers*"
-        
-        return output
-    
-    def get_mitre_technique(self, technique_id: str) -> Optional[MitreAttackTechnique]:
-        """Get a MITRE ATT&CK technique by ID"""
-        for tech in self.mitre_techniques:
-            if tech.technique_id.upper() == technique_id.upper():
-                return tech
-        return None
-    
-    def search_mitre(self, keyword: str) -> List[MitreAttackTechnique]:
-        """Search MITRE techniques by keyword"""
-        keyword = keyword.lower()
-        results = []
-        
-        for tech in self.mitre_techniques:
-            if (keyword in tech.name.lower() or 
-                keyword in tech.tactic.lower() or
-                keyword in tech.description.lower()):
-                results.append(tech)
-        
-        return results
-    
-    def format_mitre_technique(self, tech: MitreAttackTechnique) -> str:
-        """Format a MITRE technique for display"""
-        return f"""## {tech.technique_id}: {tech.name}
-
-**Tactic:** {tech.tactic}
-
-**Description:**
-{tech.description}
-
-**Detection:**
-{tech.detection}
-
-**Mitigation:**
-{tech.mitigation}
-
-🔗 Reference: https://attack.mitre.org/techniques/{tech.technique_id}/
-"""
-    
-    def get_incident_template(self) -> str:
-        """Get incident report template"""
-        return INCIDENT_REPORT_TEMPLATE
-    
-    def get_vulnerability_template(self) -> str:
-        """Get vulnerability report template"""
-        return VULNERABILITY_REPORT_TEMPLATE
-    
-    def get_hardening_checklist(self, system_type: str = "general") -> str:
-        """Get a hardening checklist"""
-        checklists = {
-            "general": """
+# Hardening Checklists
+HARDENING_CHECKLISTS = {
+    "general": """
 # 🛡️ General Security Hardening Checklist
 
 ## System Configuration
@@ -432,7 +325,7 @@ class KnowledgeBase:
 - [ ] Set up alerting for critical events
 - [ ] Perform regular vulnerability scans
 """,
-            "linux": """
+    "linux": """
 # 🐧 Linux Hardening Checklist
 
 ## System
@@ -459,7 +352,7 @@ class KnowledgeBase:
 - [ ] Forward logs to central server
 - [ ] Monitor auth logs: `/var/log/auth.log`
 """,
-            "windows": """
+    "windows": """
 # 🪟 Windows Hardening Checklist
 
 ## System
@@ -487,9 +380,146 @@ class KnowledgeBase:
 - [ ] Enable ASR rules
 - [ ] Configure AppLocker/WDAC
 """
-        }
+}
+
+# Technique IDs like "T1566", "t1059.001" or a bare "1566"
+_TECHNIQUE_ID_RE = re.compile(r'^T?(\d+(?:\.\d+)?)$', re.IGNORECASE)
+
+
+def normalize_technique_id(text: str) -> Optional[str]:
+    """Return text as a canonical technique ID ("T1566"), or None if it isn't one"""
+    match = _TECHNIQUE_ID_RE.match(text.strip())
+    return "T" + match.group(1) if match else None
+
+
+class KnowledgeBase:
+    """Manages cybersecurity knowledge and resources"""
+    
+    def __init__(self):
+        self.flashcards = tuple(FLASHCARDS)
+        # Pre-normalized filter fields so get_flashcards is a single pass
+        self._card_filters = [
+            (c, c.category.lower(), tuple(cr.upper() for cr in c.cert_relevance))
+            for c in self.flashcards
+        ]
+        self.mitre_techniques = MITRE_TECHNIQUES
+        self._id_index = {t.technique_id.upper(): t for t in self.mitre_techniques}
+        self._formatted_mitre: Dict[str, str] = {}
+        # Lowercased searchable text per technique, built once instead of per query
+        self._search_text = [
+            ("\n".join((t.name, t.tactic, t.description)).lower(), t)
+            for t in self.mitre_techniques
+        ]
+    
+    def get_flashcards(self, 
+                       category: Optional[str] = None,
+                       difficulty: Optional[str] = None,
+                       cert: Optional[str] = None,
+                       count: int = 5) -> List[Flashcard]:
+        """Get flashcards matching criteria"""
+        if category or difficulty or cert:
+            category = category.lower() if category else None
+            difficulty = difficulty.lower() if difficulty else None
+            cert = cert.upper() if cert else None
+            cards = [
+                c for c, cat, certs in self._card_filters
+                if (not category or category in cat)
+                and (not difficulty or c.difficulty == difficulty)
+                and (not cert or any(cert in cr for cr in certs))
+            ]
+        else:
+            cards = self.flashcards
+        
+        # Sample the requested count without shuffling the shared pool
+        # (a zero or negative count gives an empty list, not a ValueError)
+        if count == 1 and cards:
+            return [random.choice(cards)]
+        return random.sample(cards, max(0, min(count, len(cards))))
+    
+    def get_quiz(self, 
+                 category: Optional[str] = None,
+                 count: int = 5) -> List[Dict]:
+        """Generate a quiz from flashcards"""
+        cards = self.get_flashcards(category=category, count=count)
+        quiz = []
+        
+        for i, card in enumerate(cards, 1):
+            quiz.append({
+                "number": i,
+                "question": card.question,
+                "answer": card.answer,
+                "category": card.category,
+                "difficulty": card.difficulty
+            })
+        
+        return quiz
+    
+    def format_quiz(self, quiz: List[Dict], show_answers: bool = False) -> str:
+        """Format quiz for display"""
+        output = "# 🎯 Cybersecurity Quiz\n\n"
+        
+        for q in quiz:
+            output += f"**Q{q['number']}** [{q['category']}] ({q['difficulty']})\n"
+            output += f"{q['question']}\n\n"
+            
+            if show_answers:
+                output += f"**Answer:** {q['answer']}\n\n"
+                output += "---\n\n"
+        
+        if not show_answers:
+            output += "\n*Say 'show answers' to reveal the answers*"
         
-        return checklists.get(system_type.lower(), checklists["general"])
+        return output
+    
+    def get_mitre_technique(self, technique_id: str) -> Optional[MitreAttackTechnique]:
+        """Get a MITRE ATT&CK technique by ID"""
+        return self._id_index.get(technique_id.upper())
+    
+    def search_mitre(self, keyword: str) -> List[MitreAttackTechnique]:
+        """Search MITRE techniques by keyword"""
+        keyword = keyword.lower()
+        return [tech for text, tech in self._search_text if keyword in text]
+    
+    def format_mitre_technique(self, tech: MitreAttackTechnique) -> str:
+        """Format a MITRE technique for display"""
+        # Built-in techniques never change, so their text is rendered once
+        if self._id_index.get(tech.technique_id.upper()) is not tech:
+            return self._render_mitre_technique(tech)
+        formatted = self._formatted_mitre.get(tech.technique_id)
+        if formatted is None:
+            formatted = self._render_mitre_technique(tech)
+            self._formatted_mitre[tech.technique_id] = formatted
+        return formatted
+    
+    @staticmethod
+    def _render_mitre_technique(tech: MitreAttackTechnique) -> str:
+        return f"""## {tech.technique_id}: {tech.name}
+
+**Tactic:** {tech.tactic}
+
+**Description:**
+{tech.description}
+
+**Detection:**
+{tech.detection}
+
+**Mitigation:**
+{tech.mitigation}
+
+🔗 Reference: https://attack.mitre.org/techniques/{tech.technique_id}/
+"""
+    
+    def get_incident_template(self) -> str:
+        """Get incident report template"""
+        return INCIDENT_REPORT_TEMPLATE
+    
+    def get_vulnerability_template(self) -> str:
+        """Get vulnerability report template"""
+        return VULNERABILITY_REPORT_TEMPLATE
+    
+    def get_hardening_checklist(self, system_type: str = "general") -> str:
+        """Get a hardening checklist"""
+        return HARDENING_CHECKLISTS.get(system_type.lower(), HARDENING_CHECKLISTS["general"])
 
 
 # Global instance
@@ -3,10 +3,32 @@ Spider Cybersecurity Tutor - Safety Module
 Content filtering and safety checks
 """
 
+import logging
 import re
+from functools import lru_cache
 from typing import Tuple, List
 from dataclasses import dataclass
 
+# Optional: RE2 guarantees linear-time matching on user-supplied text
+try:
+    import re2
+    RE2_AVAILABLE = True
+except ImportError:
+    RE2_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+
+def _compile(pattern: str):
+    """Compile a case-insensitive pattern with RE2 if available, else re"""
+    if RE2_AVAILABLE:
+        # google-re2 has no IGNORECASE flag; use the inline form instead
+        try:
+            return re2.compile("(?i)" + pattern)
+        except re2.error as e:
+            logger.warning("RE2 rejected a safety pattern, using re: %s", e)
+    return re.compile(pattern, re.IGNORECASE)
+
 
 @dataclass
 class SafetyCheck:
@@ -63,6 +85,15 @@ HARMFUL_PATTERNS = [
      "unauthorized system access"),
 ]
 
+# Every HARMFUL_PATTERNS entry starts with a word boundary followed by one of
+# these words, so text containing none of them can skip the full pattern scan.
+# A literal, anchored alternation is much cheaper to search than the patterns.
+# Keep in sync when adding patterns above.
+TRIGGER_WORDS = _compile(
+    r'\b(?:write|create|give|provide|show|reverse|bind|how|malware|crack|'
+    r'brute|steal|hash|bypass|evade|avoid|ddos|dos|man|sql|xss|without|no|access)'
+)
+
 # Defensive/educational keywords that might make harmful patterns acceptable
 DEFENSIVE_CONTEXT = [
     r'\bdefend\b', r'\bdefense\b', r'\bdefensive\b',
@@ -80,14 +111,77 @@ DEFENSIVE_CONTEXT = [
 ]
 
 
+# Suggestions offered when a request is blocked, keyed by (part of) the
+# HARMFUL_PATTERNS description
+SAFE_ALTERNATIVES = {
+    "exploit/payload creation": 
+        "I can explain how exploits work conceptually, discuss CVE details, "
+        "or help you set up detection for exploit attempts.",
+    
+    "reverse/bind shell creation":
+        "I can explain what reverse shells are, how to detect them in network traffic, "
+        "and how to harden systems against them.",
+    
+    "intrusion guidance":
+        "I can help you understand attack techniques for defensive purposes, "
+        "set up authorized penetration testing, or improve your security posture.",
+    
+    "malware creation":
+        "I can explain malware behavior, help you analyze samples safely, "
+        "or set up detection rules for malware indicators.",
+    
+    "credential attacks":
+        "I can help you implement strong authentication, detect credential attacks, "
+        "and set up password policies and monitoring.",
+    
+    "security bypass":
+        "I can help you test your security controls legitimately, "
+        "improve defense-in-depth, and detect bypass attempts.",
+    
+    "detection evasion":
+        "I can help improve your detection capabilities, understand evasion techniques "
+        "for better defense, and tune your security tools.",
+    
+    "denial of service":
+        "I can help you protect against DoS attacks, set up rate limiting, "
+        "and implement DDoS mitigation strategies.",
+    
+    "SQL injection payload":
+        "I can help you understand SQL injection for defensive purposes, "
+        "implement input validation, and set up WAF rules.",
+    
+    "XSS payload":
+        "I can help you understand XSS for defensive purposes, "
+        "implement CSP headers, and sanitize user input.",
+    
+    "unauthorized access":
+        "I can only help with authorized security testing. "
+        "I can assist with setting up proper authorization for pentests.",
+}
+
+DEFAULT_ALTERNATIVE = ("I can help you understand this topic from a defensive perspective, "
+                       "set up detection, or improve your security posture.")
+
+
+def _find_safe_alternative(topic: str) -> str:
+    for key, suggestion in SAFE_ALTERNATIVES.items():
+        if key in topic:
+            return suggestion
+    return DEFAULT_ALTERNATIVE
+
+
 class SafetyFilter:
     """Filters content for safety"""
     
     def __init__(self):
         self.harmful_patterns = [(re.compile(p, re.IGNORECASE), desc) 
                                   for p, desc in HARMFUL_PATTERNS]
-        self.defensive_patterns = [re.compile(p, re.IGNORECASE) 
-                                   for p in DEFENSIVE_CONTEXT]
+        # Each description's suggestion, resolved once instead of per block
+        self._alternatives = {desc: _find_safe_alternative(desc) for _, desc in HARMFUL_PATTERNS}
+        # One combined pattern per list, so the common (safe) path is a
+        # single scan of the text instead of one search per pattern
+        self.harmful_regex = _compile("|".join(f"(?:{p})" for p, _ in HARMFUL_PATTERNS))
+        self.defensive_regex = _compile("|".join(f"(?:{p})" for p in DEFENSIVE_CONTEXT))
     
     def check_input(self, text: str) -> SafetyCheck:
         """
@@ -99,22 +193,17 @@ class SafetyFilter:
         Returns:
             SafetyCheck with result
         """
-        text_lower = text.lower()
-        
-        # Check for harmful patterns
-        for pattern, description in self.harmful_patterns:
-            if pattern.search(text_lower):
-                # Check if there's defensive context
-                has_defensive_context = any(
-                    dp.search(text_lower) for dp in self.defensive_patterns
-                )
-                
-                if not has_defensive_context:
-                    return SafetyCheck(
-                        is_safe=False,
-                        reason=f"Request appears to involve {description}",
-                        suggestion=self._get_safe_alternative(description)
-                    )
+        # Check for harmful patterns, unless there's defensive context
+        match = TRIGGER_WORDS.search(text) and self.harmful_regex.search(text)
+        if match and not self.defensive_regex.search(text):
+            # Blocked (rare): name it by the first pattern in list order, as
+            # the per-pattern loop did, not by the leftmost match
+            description = self._describe_match(text)
+            return SafetyCheck(
+                is_safe=False,
+                reason=f"Request appears to involve {description}",
+                suggestion=self._get_safe_alternative(description)
+            )
         
         return SafetyCheck(
             is_safe=True,
@@ -122,60 +211,19 @@ class SafetyFilter:
             suggestion=""
         )
     
+    def _describe_match(self, text: str) -> str:
+        """Description of the first pattern (in list order) matching text"""
+        for pattern, description in self.harmful_patterns:
+            if pattern.search(text):
+                return description
+        return HARMFUL_PATTERNS[0][1]
+    
     def _get_safe_alternative(self, topic: str) -> str:
         """Get a safe alternative suggestion for a blocked topic"""
-        alternatives = {
-            "exploit/payload creation": 
-                "I can explain how exploits work conceptually, discuss CVE details, "
-                "or help you set up detection for exploit attempts.",
-            
-            "reverse/bind shell creation":
-                "I can explain what reverse shells are, how to detect them in network traffic, "
-                "and how to harden systems against them.",
-            
-            "intrusion guidance":
-                "I can help you understand attack techniques for defensive purposes, "
-                "set up authorized penetration testing, or improve your security posture.",
-            
-            "malware creation":
-                "I can explain malware behavior, help you analyze samples safely, "
-                "or set up detection rules for malware indicators.",
-            
-            "credential attacks":
-                "I can help you implement strong authentication, detect credential attacks, "
-                "and set up password policies and monitoring.",
-            
-            "security bypass":
-                "I can help you test your security controls legitimately, "
-                "improve defense-in-depth, and detect bypass attempts.",
-            
-            "detection evasion":
-                "I can help improve your detection capabilities, understand evasion techniques "
-                "for better defense, and tune your security tools.",
-            
-            "denial of service":
-                "I can help you protect against DoS attacks, set up rate limiting, "
-                "and implement DDoS mitigation strategies.",
-            
-            "SQL injection payload":
-                "I can help you understand SQL injection for defensive purposes, "
-                "implement input validation, and set up WAF rules.",
-            
-            "XSS payload":
-                "I can help you understand XSS for defensive purposes, "
-                "implement CSP headers, and sanitize user input.",
-            
-            "unauthorized access":
-                "I can only help with authorized security testing. "
-                "I can assist with setting up proper authorization for pentests.",
-        }
-        
-        for key, suggestion in alternatives.items():
-            if key in topic:
-                return suggestion
-        
-        return ("I can help you understand this topic from a defensive perspective, "
-                "set up detection, or improve your security posture.")
+        suggestion = self._alternatives.get(topic)
+        if suggestion is None:
+            suggestion = _find_safe_alternative(topic)
+        return suggestion
     
     def get_safety_response(self, check: SafetyCheck) -> str:
         """Generate a helpful refusal response"""
@@ -200,17 +248,46 @@ Would you like me to help with any of these instead?"""
 safety_filter = SafetyFilter()
 
 
-def check_safety(text: str) -> Tuple[bool, str]:
+def is_trivially_safe(text: str, max_length: int = 64) -> bool:
     """
-    Quick safety check function
+    Cheap pre-check for short messages that cannot match any harmful pattern
     
     Args:
         text: Text to check
+        max_length: Longer inputs always go through the full check
         
     Returns:
-        Tuple of (is_safe, message)
+        True if the full safety check can be skipped
     """
+    return len(text) < max_length and not TRIGGER_WORDS.search(text)
+
+
+# Results for repeated messages (retries, re-renders) are cached; long
+# inputs bypass the cache so it can't grow without bound
+SAFETY_CACHE_SIZE = 4096
+SAFETY_CACHE_MAX_LENGTH = 2048
+
+
+def _check_safety(text: str) -> Tuple[bool, str]:
     check = safety_filter.check_input(text)
     if check.is_safe:
         return True, ""
-    return False, safety_filter.get_safety_response(check)
\ No newline at end of file
+    return False, safety_filter.get_safety_response(check)
+
+
+_check_safety_cached = lru_cache(maxsize=SAFETY_CACHE_SIZE)(_check_safety)
+
+
+def check_safety(text: str) -> Tuple[bool, str]:
+    """
+    Quick safety check function
+    
+    Args:
+        text: Text to check
+        
+    Returns:
+        Tuple of (is_safe, message)
+    """
+    if len(text) > SAFETY_CACHE_MAX_LENGTH:
+        return _check_safety(text)
+    return _check_safety_cached(text)
\ No newline at end of file
@@ -3,6 +3,12 @@ Spider Cybersecurity Tutor - Voice Module
 Handles Speech-to-Text (STT) and Text-to-Speech (TTS)
 """
 
+import importlib.util
+import io
+import os
+import re
+import shutil
+import tempfile
 import threading
 import queue
 from typing import Optional, Callable
@@ -10,28 +16,37 @@ from rich.console import Console
 
 console = Console()
 
-# Try importing voice libraries
-try:
-    import speech_recognition as sr
-    STT_AVAILABLE = True
-except ImportError:
-    STT_AVAILABLE = False
+# Check which voice libraries are installed without importing them; the
+# speech and TTS packages are slow to load (pyttsx3 initializes COM on
+# Windows), so each is imported only when its engine is first used
+STT_AVAILABLE = importlib.util.find_spec("speech_recognition") is not None
+if not STT_AVAILABLE:
     console.print("[yellow]⚠️ SpeechRecognition not installed. Voice input disabled.[/yellow]")
 
-try:
-    import pyttsx3
-    PYTTSX3_AVAILABLE = True
-except ImportError:
-    PYTTSX3_AVAILABLE = False
+PYTTSX3_AVAILABLE = importlib.util.find_spec("pyttsx3") is not None
 
-try:
-    from gtts import gTTS
-    import playsound
-    import tempfile
-    import os
-    GTTS_AVAILABLE = True
-except ImportError:
-    GTTS_AVAILABLE = False
+GTTS_AVAILABLE = (importlib.util.find_spec("gtts") is not None
+                  and importlib.util.find_spec("playsound") is not None)
+
+# pydub decodes mp3 by shelling out to ffmpeg (or avconv); without one the
+# temp file + playsound path is used instead
+STREAM_PLAYBACK_AVAILABLE = (importlib.util.find_spec("pydub") is not None
+                             and importlib.util.find_spec("simpleaudio") is not None
+                             and (shutil.which("ffmpeg") or shutil.which("avconv")) is not None)
+
+# Pending non-blocking utterances; the oldest is dropped when full
+SPEECH_QUEUE_SIZE = 4
+
+# Markdown/emoji cleanup applied before speaking
+_MD_BOLD = re.compile(r'\*\*(.+?)\*\*')
+_MD_ITALIC = re.compile(r'\*(.+?)\*')
+_MD_CODE = re.compile(r'`(.+?)`')
+_MD_HEADER = re.compile(r'#{1,6}\s*')
+_MD_LINK = re.compile(r'\[(.+?)\]\(.+?\)')
+# Includes the U+FE0F variation selectors that follow some of the emoji
+_EMOJI_TABLE = dict.fromkeys(map(ord, '🕷️🛡️📋✅❌⚠️🔒🔓💡📚🎯'), None)
+_NEWLINES = re.compile(r'\n+')
+_WHITESPACE = re.compile(r'\s+')
 
 
 class VoiceInput:
@@ -39,11 +54,14 @@ class VoiceInput:
     
     def __init__(self, engine: str = "google"):
         self.engine = engine
-        self.recognizer = sr.Recognizer() if STT_AVAILABLE else None
+        self.recognizer = None
         self.microphone = None
+        self._mic_source = None
         self.is_listening = False
         
         if STT_AVAILABLE:
+            import speech_recognition as sr
+            self.recognizer = sr.Recognizer()
             try:
                 self.microphone = sr.Microphone()
                 # Adjust for ambient noise
@@ -54,6 +72,21 @@ class VoiceInput:
                 console.print(f"[yellow]⚠️ Microphone error: {e}[/yellow]")
                 self.microphone = None
     
+    def _ensure_open(self):
+        """Enter the microphone context and keep the stream open (continuous listening)"""
+        if self._mic_source is None:
+            self._mic_source = self.microphone.__enter__()
+        return self._mic_source
+    
+    def close(self):
+        """Release the held microphone stream"""
+        if self._mic_source is not None:
+            try:
+                self.microphone.__exit__(None, None, None)
+            except Exception:
+                pass
+            self._mic_source = None
+    
     def listen(self, timeout: int = 5, phrase_limit: int = 15) -> Optional[str]:
         """
         Listen for voice input and convert to text
@@ -68,16 +101,26 @@ class VoiceInput:
         if not STT_AVAILABLE or not self.microphone:
             return None
         
+        import speech_recognition as sr
+        
         try:
             console.print("[cyan]🎤 Listening...[/cyan]")
             self.is_listening = True
             
-            with self.microphone as source:
+            if self._mic_source is not None:
+                # Inside listen_continuous: reuse the held stream
                 audio = self.recognizer.listen(
-                    source, 
+                    self._mic_source,
                     timeout=timeout,
                     phrase_time_limit=phrase_limit
                 )
+            else:
+                with self.microphone as source:
+                    audio = self.recognizer.listen(
+                        source,
+                        timeout=timeout,
+                        phrase_time_limit=phrase_limit
+                    )
             
             console.print("[cyan]🔄 Processing speech...[/cyan]")
             
@@ -112,13 +155,21 @@ class VoiceInput:
         """
         console.print(f"[cyan]🎤 Continuous listening started. Say '{stop_phrase}' to stop.[/cyan]")
         
-        while True:
-            text = self.listen()
-            if text:
-                if stop_phrase.lower() in text.lower():
-                    console.print("[cyan]🛑 Stopping continuous listening[/cyan]")
-                    break
-                callback(text)
+        if not STT_AVAILABLE or not self.microphone:
+            return
+        
+        # Hold the stream open across phrases; released when the loop ends
+        self._ensure_open()
+        try:
+            while True:
+                text = self.listen()
+                if text:
+                    if stop_phrase.lower() in text.lower():
+                        console.print("[cyan]🛑 Stopping continuous listening[/cyan]")
+                        break
+                    callback(text)
+        finally:
+            self.close()
 
 
 class VoiceOutput:
@@ -129,58 +180,136 @@ class VoiceOutput:
         self.rate = rate
         self.engine = None
         self.is_speaking = False
-        self.speech_queue = queue.Queue()
+        self.speech_queue = queue.Queue(maxsize=SPEECH_QUEUE_SIZE)
+        self._worker: Optional[threading.Thread] = None
+        self._worker_lock = threading.Lock()
+        self._engine_ready = threading.Event()
         
         self._init_engine()
     
     def _init_engine(self):
         """Initialize the TTS engine"""
         if self.engine_name == "pyttsx3" and PYTTSX3_AVAILABLE:
-            try:
-                self.engine = pyttsx3.init()
-                self.engine.setProperty('rate', self.rate)
-                
-                # Try to set a natural voice
-                voices = self.engine.getProperty('voices')
-                if voices:
-                    # Prefer female voice if available (often clearer)
-                    for voice in voices:
-                        if 'female' in voice.name.lower() or 'zira' in voice.name.lower():
-                            self.engine.setProperty('voice', voice.id)
-                            break
-                
-                console.print("[green]🔊 TTS engine (pyttsx3) initialized[/green]")
-            except Exception as e:
-                console.print(f"[yellow]⚠️ pyttsx3 error: {e}[/yellow]")
-                self.engine = None
+            # pyttsx3's drivers (SAPI5/COM, NSSpeech) are thread-affine, so
+            # the engine is created, and only ever used, on the speech worker
+            self._start_worker()
+            self._engine_ready.wait()
                 
         elif self.engine_name == "gtts" and GTTS_AVAILABLE:
             console.print("[green]🔊 TTS engine (gTTS) ready[/green]")
         else:
             console.print("[yellow]⚠️ No TTS engine available[/yellow]")
     
+    def _create_pyttsx3(self):
+        """Build the pyttsx3 engine (runs on the speech worker thread)"""
+        try:
+            import pyttsx3
+            self.engine = pyttsx3.init()
+            self.engine.setProperty('rate', self.rate)
+            
+            # Try to set a natural voice
+            voices = self.engine.getProperty('voices')
+            if voices:
+                # Prefer female voice if available (often clearer)
+                for voice in voices:
+                    if 'female' in voice.name.lower() or 'zira' in voice.name.lower():
+                        self.engine.setProperty('voice', voice.id)
+                        break
+            
+            console.print("[green]🔊 TTS engine (pyttsx3) initialized[/green]")
+        except Exception as e:
+            console.print(f"[yellow]⚠️ pyttsx3 error: {e}[/yellow]")
+            self.engine = None
+        finally:
+            self._engine_ready.set()
+    
     def speak(self, text: str, block: bool = True):
         """
         Convert text to speech
         
         Args:
             text: Text to speak
-            block: If True, wait for speech to complete
+            block: If True, wait for speech to complete; otherwise queue it
+                and return at once
         """
         if not text:
             return
         
+        # Everything is spoken on the worker thread, which owns the engine
+        if block:
+            done = threading.Event()
+            self._enqueue(text, done)
+            done.wait()
+        else:
+            self._enqueue(text)
+    
+    def _speak_now(self, text: str):
+        """Speak text (speech worker thread only)"""
         # Clean text for speech
         clean_text = self._clean_for_speech(text)
         
         if self.engine_name == "pyttsx3" and self.engine:
-            self._speak_pyttsx3(clean_text, block)
+            self._speak_pyttsx3(clean_text, True)
         elif self.engine_name == "gtts" and GTTS_AVAILABLE:
             self._speak_gtts(clean_text)
         else:
             # Fallback: just print
             console.print(f"[dim]🔇 (TTS disabled) {clean_text[:100]}...[/dim]")
     
+    def _start_worker(self):
+        """Start the speech worker thread once"""
+        with self._worker_lock:
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._speech_loop, daemon=True)
+                self._worker.start()
+    
+    def _enqueue(self, text: str, done: Optional[threading.Event] = None):
+        """
+        Queue text for the speech worker
+        
+        Args:
+            text: Text to speak
+            done: Set once the text has been spoken (or dropped); blocking
+                callers wait for queue space instead of dropping anything
+        """
+        self._start_worker()
+        
+        if done is not None:
+            self.speech_queue.put((text, done))
+            return
+        
+        # Non-blocking: drop the oldest pending utterance if full
+        while True:
+            try:
+                self.speech_queue.put_nowait((text, None))
+                return
+            except queue.Full:
+                try:
+                    _, dropped_done = self.speech_queue.get_nowait()
+                    self.speech_queue.task_done()
+                    if dropped_done is not None:
+                        dropped_done.set()
+                except queue.Empty:
+                    pass
+    
+    def _speech_loop(self):
+        """Single worker so utterances never overlap on the audio device"""
+        if self.engine_name == "pyttsx3" and PYTTSX3_AVAILABLE:
+            self._create_pyttsx3()
+        
+        while True:
+            text, done = self.speech_queue.get()
+            try:
+                self._speak_now(text)
+            finally:
+                self.speech_queue.task_done()
+                if done is not None:
+                    done.set()
+    
+    def flush(self):
+        """Block until every queued utterance has been spoken"""
+        self.speech_queue.join()
+    
     def _speak_pyttsx3(self, text: str, block: bool):
         """Speak using pyttsx3"""
         try:
@@ -196,16 +325,33 @@ class VoiceOutput:
     def _speak_gtts(self, text: str):
         """Speak using Google TTS"""
         try:
+            from gtts import gTTS
+            
             self.is_speaking = True
             tts = gTTS(text=text, lang='en', slow=False)
             
-            # Save to temp file and play
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.mp3') as fp:
-                temp_path = fp.name
-                tts.save(temp_path)
-            
-            playsound.playsound(temp_path)
-            os.unlink(temp_path)
+            if STREAM_PLAYBACK_AVAILABLE:
+                from pydub import AudioSegment
+                import simpleaudio
+                
+                # Decode and play from memory, no temp file round-trip
+                buf = io.BytesIO()
+                tts.write_to_fp(buf)
+                buf.seek(0)
+                seg = AudioSegment.from_file(buf, format='mp3')
+                simpleaudio.play_buffer(
+                    seg.raw_data, seg.channels, seg.sample_width, seg.frame_rate
+                ).wait_done()
+            else:
+                import playsound
+                
+                # Save to temp file and play
+                with tempfile.NamedTemporaryFile(delete=False, suffix='.mp3') as fp:
+                    temp_path = fp.name
+                    tts.write_to_fp(fp)
+                
+                playsound.playsound(temp_path)
+                os.unlink(temp_path)
             self.is_speaking = False
         except Exception as e:
             console.print(f"[red]❌ gTTS error: {e}[/red]")
@@ -213,31 +359,34 @@ class VoiceOutput:
     
     def _clean_for_speech(self, text: str) -> str:
         """Clean text for better speech output"""
-        import re
-        
         # Remove markdown formatting
-        text = re.sub(r'\*\*(.+?)\*\*', r'\1', text)  # Bold
-        text = re.sub(r'\*(.+?)\*', r'\1', text)      # Italic
-        text = re.sub(r'`(.+?)`', r'\1', text)        # Code
-        text = re.sub(r'#{1,6}\s*', '', text)         # Headers
-        text = re.sub(r'\[(.+?)\]\(.+?\)', r'\1', text)  # Links
+        text = _MD_BOLD.sub(r'\1', text)
+        text = _MD_ITALIC.sub(r'\1', text)
+        text = _MD_CODE.sub(r'\1', text)
+        text = _MD_HEADER.sub('', text)
+        text = _MD_LINK.sub(r'\1', text)
         
         # Remove emojis (keep text readable)
-        text = re.sub(r'[🕷️🛡️📋✅❌⚠️🔒🔓💡📚🎯]', '', text)
+        text = text.translate(_EMOJI_TABLE)
         
         # Clean up extra whitespace
-        text = re.sub(r'\n+', '. ', text)
-        text = re.sub(r'\s+', ' ', text)
+        text = _NEWLINES.sub('. ', text)
+        text = _WHITESPACE.sub(' ', text)
         
         return text.strip()
     
     def stop(self):
-        """Stop current speech"""
-        if self.engine_name == "pyttsx3" and self.engine:
+        """Stop speech by discarding everything still queued"""
+        # The engine belongs to the worker thread, so it is never touched
+        # from here; the current utterance finishes on its own
+        while True:
             try:
-                self.engine.stop()
-            except:
-                pass
+                _, done = self.speech_queue.get_nowait()
+            except queue.Empty:
+                break
+            self.speech_queue.task_done()
+            if done is not None:
+                done.set()
         self.is_speaking = False
 
 
@@ -271,6 +420,16 @@ class VoiceManager:
         if self.output:
             self.output.speak(text, block=block)
     
+    def flush(self):
+        """Wait for queued (non-blocking) speech to finish"""
+        if self.output:
+            self.output.flush()
+    
+    def close(self):
+        """Release the microphone"""
+        if self.input:
+            self.input.close()
+    
     def is_available(self) -> bool:
         """Check if voice features are available"""
         return self.enabled and (self.input is not None or self.output is not None)
\ No newline at end of file
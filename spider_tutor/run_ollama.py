@@ -3,17 +3,26 @@
 Monitor Ollama model download progress and auto-run Spider once ready
 """
 
+import os
 import time
-import subprocess
 import sys
 from pathlib import Path
 
+import requests
+
+OLLAMA_URL = "http://localhost:11434"
+
+# Poll interval grows from the first to the max delay while the model downloads
+POLL_INITIAL_DELAY = 0.5
+POLL_MAX_DELAY = 10.0
+
 def check_model_ready():
     """Check if neural-chat model is ready"""
+    # Ask the Ollama HTTP API rather than forking `ollama list` on every poll
     try:
-        result = subprocess.run(['ollama', 'list'], capture_output=True, text=True, timeout=5)
-        models = result.stdout
-        return 'neural-chat' in models
+        response = requests.get(f"{OLLAMA_URL}/api/tags", timeout=2)
+        models = response.json().get("models", [])
+        return any('neural-chat' in m.get("name", "") for m in models)
     except:
         return False
 
@@ -22,11 +31,13 @@ def wait_for_model():
     print("⏳ Waiting for neural-chat model to download...\n")
     
     start_time = time.time()
+    delay = POLL_INITIAL_DELAY
     while not check_model_ready():
         elapsed = int(time.time() - start_time)
         dots = "." * (elapsed % 4)
         print(f"\r⏳ Still downloading {dots:<3}", end="", flush=True)
-        time.sleep(1)
+        time.sleep(delay)
+        delay = min(delay * 1.5, POLL_MAX_DELAY)
     
     print("\n\n✅ Neural-chat model is ready!\n")
     return True
@@ -36,15 +47,11 @@ def run_spider():
     print("🕷️  Starting Spider Tutor...\n")
     spider_dir = Path(__file__).parent
     
-    try:
-        subprocess.run(
-            ['python', 'main.py'],
-            cwd=spider_dir,
-            check=False
-        )
-    except KeyboardInterrupt:
-        print("\n\n👋 Goodbye!")
-        sys.exit(0)
+    # Replace this wrapper process rather than keeping it alive as a parent;
+    # Ctrl+C then goes straight to Spider
+    sys.stdout.flush()
+    os.chdir(spider_dir)
+    os.execv(sys.executable, [sys.executable, 'main.py'])
 
 if __name__ == "__main__":
     if check_model_ready():
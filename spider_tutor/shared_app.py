@@ -5,41 +5,117 @@ Uses Gradio's sharing mechanism with FastAPI backend
 """
 
 import gradio as gr
-import requests
+import httpx
 import json
-from typing import List, Tuple
+import os
+import threading
+import time
+from typing import AsyncGenerator, Dict, List, Tuple
 
 # Configuration
 API_URL = "http://localhost:8000"
+API_TIMEOUT = 30
+CHAT_TIMEOUT = 120  # LLM replies can take a while
+
+# Startup readiness probe: delay doubles up to the max, for at most READY_TIMEOUT
+READY_TIMEOUT = 30
+READY_PROBE_TIMEOUT = 0.5
+READY_INITIAL_DELAY = 0.05
+READY_MAX_DELAY = 1.0
+
+# One keep-alive async connection pool to the FastAPI backend; handlers are
+# async so in-flight API calls don't each hold a server worker thread
+_CLIENT = httpx.AsyncClient(
+    base_url=API_URL,
+    timeout=API_TIMEOUT,
+    limits=httpx.Limits(max_keepalive_connections=16, max_connections=32)
+)
 
 # ============================================================================
 # Gradio Interface Components
 # ============================================================================
 
-def chat_interface(message: str, chat_history: List[Tuple[str, str]]) -> Tuple[str, List[Tuple[str, str]]]:
-    """Chat interface"""
+# Chat streams over /api/chat/stream; if the backend doesn't have it, this
+# process falls back to the buffered /api/chat for good
+_chat_streaming = True
+
+class _NoStreamEndpoint(Exception):
+    """The backend has no /api/chat/stream route"""
+
+def _error_detail(response: httpx.Response) -> str:
+    """Error text from a JSON error response"""
+    try:
+        data = response.json()
+    except ValueError:
+        return f"HTTP {response.status_code}"
+    return data.get("error") or data.get("detail", "Error")
+
+async def _stream_reply(message: str) -> AsyncGenerator[str, None]:
+    """
+    Yield the reply in chunks as the backend streams it (Server-Sent Events)
+    
+    Raises:
+        _NoStreamEndpoint: The backend has no streaming endpoint
+    """
+    async with _CLIENT.stream("POST", "/api/chat/stream",
+                              json={"message": message}, timeout=CHAT_TIMEOUT) as response:
+        if response.status_code in (404, 405):
+            raise _NoStreamEndpoint()
+        if response.status_code != 200:
+            await response.aread()
+            yield f"❌ Error: {_error_detail(response)}"
+            return
+        
+        event = None
+        async for line in response.aiter_lines():
+            if line.startswith("event: "):
+                event = line[7:]
+            elif line.startswith("data: "):
+                if event == "done":
+                    return
+                text = json.loads(line[6:])
+                yield f"❌ Error: {text}" if event == "error" else text
+            elif not line:
+                event = None
+
+async def _buffered_reply(message: str) -> str:
+    """Get the whole reply in one POST"""
+    response = await _CLIENT.post("/api/chat", json={"message": message}, timeout=CHAT_TIMEOUT)
+    if response.status_code == 200:
+        return response.json().get("response", "No response")
+    return f"❌ Error: {_error_detail(response)}"
+
+async def chat_interface(message: str, chat_history: List[Dict[str, str]]) -> AsyncGenerator[Tuple[str, List[Dict[str, str]]], None]:
+    """Chat interface (Gradio "messages" history format), updated as the reply streams in"""
+    global _chat_streaming
     if not message.strip():
-        return "", chat_history
+        yield "", chat_history
+        return
+    
+    chat_history.append({"role": "user", "content": message})
+    reply = {"role": "assistant", "content": ""}
+    chat_history.append(reply)
+    yield "", chat_history
     
     try:
-        response = requests.post(f"{API_URL}/api/chat", json={"message": message})
-        if response.status_code == 200:
-            data = response.json()
-            bot_message = data.get("response", "No response")
-            chat_history.append((message, bot_message))
-            return "", chat_history
-        else:
-            error = response.json().get("detail", "Error")
-            chat_history.append((message, f"❌ Error: {error}"))
-            return "", chat_history
+        if _chat_streaming:
+            try:
+                async for text in _stream_reply(message):
+                    reply["content"] += text
+                    yield "", chat_history
+                return
+            except _NoStreamEndpoint:
+                _chat_streaming = False
+        
+        reply["content"] = await _buffered_reply(message)
     except Exception as e:
-        chat_history.append((message, f"❌ Error: {str(e)}"))
-        return "", chat_history
+        reply["content"] = f"❌ Error: {str(e)}"
+    yield "", chat_history
 
-def get_flashcard():
+async def get_flashcard():
     """Get random flashcard"""
     try:
-        response = requests.get(f"{API_URL}/api/flashcard")
+        response = await _CLIENT.get("/api/flashcard")
         if response.status_code == 200:
             data = response.json()
             return f"""
@@ -56,10 +132,10 @@ def get_flashcard():
     except Exception as e:
         return f"❌ Error: {str(e)}"
 
-def generate_quiz(count: int):
+async def generate_quiz(count: int):
     """Generate quiz"""
     try:
-        response = requests.post(f"{API_URL}/api/quiz", json={"count": count})
+        response = await _CLIENT.post("/api/quiz", json={"count": count})
         if response.status_code == 200:
             data = response.json()
             output = "### 📝 Quiz Questions\n\n"
@@ -72,13 +148,13 @@ def generate_quiz(count: int):
     except Exception as e:
         return f"❌ Error: {str(e)}"
 
-def search_mitre(tech_id: str):
+async def search_mitre(tech_id: str):
     """Search MITRE ATT&CK"""
     if not tech_id.strip():
         return "❌ Please enter a technique ID"
     
     try:
-        response = requests.post(f"{API_URL}/api/mitre", json={"tech_id": tech_id})
+        response = await _CLIENT.post("/api/mitre", json={"tech_id": tech_id})
         if response.status_code == 200:
             data = response.json()
             if "results" in data:
@@ -93,10 +169,10 @@ def search_mitre(tech_id: str):
     except Exception as e:
         return f"❌ Error: {str(e)}"
 
-def get_incident_template():
+async def get_incident_template():
     """Get incident template"""
     try:
-        response = requests.get(f"{API_URL}/api/incident-template")
+        response = await _CLIENT.get("/api/incident-template")
         if response.status_code == 200:
             data = response.json()
             return data['template']
@@ -105,10 +181,10 @@ def get_incident_template():
     except Exception as e:
         return f"❌ Error: {str(e)}"
 
-def get_vuln_template():
+async def get_vuln_template():
     """Get vulnerability template"""
     try:
-        response = requests.get(f"{API_URL}/api/vuln-template")
+        response = await _CLIENT.get("/api/vuln-template")
         if response.status_code == 200:
             data = response.json()
             return data['template']
@@ -117,10 +193,10 @@ def get_vuln_template():
     except Exception as e:
         return f"❌ Error: {str(e)}"
 
-def get_checklist(system_type: str):
+async def get_checklist(system_type: str):
     """Get hardening checklist"""
     try:
-        response = requests.get(f"{API_URL}/api/checklist/{system_type}")
+        response = await _CLIENT.get(f"/api/checklist/{system_type.lower()}")
         if response.status_code == 200:
             data = response.json()
             return data['checklist']
@@ -133,6 +209,17 @@ def get_checklist(system_type: str):
 # Create Gradio Interface
 # ============================================================================
 
+# Gradio queue tuning: LLM calls are slow, lookups are cheap
+QUEUE_CONCURRENCY = 8
+QUEUE_MAX_SIZE = 64
+CHAT_CONCURRENCY = 4
+LOOKUP_CONCURRENCY = 16
+# Sync handlers run in the server threadpool (Gradio default: 40)
+MAX_THREADS = 80
+# This entry point exists to publish a Gradio share link, so it is on
+# unless SPIDER_SHARE=0 (e.g. behind tunnel.py, which already exposes it)
+SHARE_LINK = os.environ.get("SPIDER_SHARE", "1") == "1"
+
 def create_interface():
     """Create the Gradio interface"""
     
@@ -226,7 +313,7 @@ def create_interface():
             gr.Markdown("Ask any cybersecurity question and get instant AI responses!")
             
             with gr.Row():
-                chatbot = gr.Chatbot(label="🤖 Spider Chat", height=500)
+                chatbot = gr.Chatbot(label="🤖 Spider Chat", height=500, type="messages")
             
             with gr.Row():
                 message = gr.Textbox(placeholder="Ask a cybersecurity question...")
@@ -234,7 +321,8 @@ def create_interface():
             message.submit(
                 chat_interface,
                 inputs=[message, chatbot],
-                outputs=[message, chatbot]
+                outputs=[message, chatbot],
+                concurrency_limit=CHAT_CONCURRENCY
             )
         
         # ====== Flashcards Tab ======
@@ -244,7 +332,7 @@ def create_interface():
             btn = gr.Button("Get Random Flashcard")
             output = gr.Markdown()
             
-            btn.click(get_flashcard, outputs=output)
+            btn.click(get_flashcard, outputs=output, concurrency_limit=LOOKUP_CONCURRENCY)
         
         # ====== Quiz Tab ======
         with gr.Tab("📝 Quiz"):
@@ -253,7 +341,7 @@ def create_interface():
             count = gr.Slider(1, 20, value=5, label="Number of Questions")
             btn = gr.Button("Generate Quiz")
             output = gr.Markdown()
-            btn.click(generate_quiz, inputs=count, outputs=output)
+            btn.click(generate_quiz, inputs=count, outputs=output, concurrency_limit=LOOKUP_CONCURRENCY)
         
         # ====== MITRE Tab ======
         with gr.Tab("🎯 MITRE ATT&CK"):
@@ -262,7 +350,7 @@ def create_interface():
             tech_id = gr.Textbox(placeholder="T1566 or keyword", label="Technique ID/Keyword")
             btn = gr.Button("Search")
             output = gr.Markdown()
-            btn.click(search_mitre, inputs=tech_id, outputs=output)
+            btn.click(search_mitre, inputs=tech_id, outputs=output, concurrency_limit=LOOKUP_CONCURRENCY)
         
         # ====== Templates Tab ======
         with gr.Tab("📋 Templates"):
@@ -272,8 +360,8 @@ def create_interface():
             vuln_btn = gr.Button("Vulnerability Template")
             output = gr.Markdown()
             
-            incident_btn.click(get_incident_template, outputs=output)
-            vuln_btn.click(get_vuln_template, outputs=output)
+            incident_btn.click(get_incident_template, outputs=output, concurrency_limit=LOOKUP_CONCURRENCY)
+            vuln_btn.click(get_vuln_template, outputs=output, concurrency_limit=LOOKUP_CONCURRENCY)
         
         # ====== Checklist Tab ======
         with gr.Tab("✅ Hardening Checklists"):
@@ -290,9 +378,10 @@ def create_interface():
             output = gr.Markdown()
             
             btn.click(
-                lambda x: get_checklist(x.lower()),
+                get_checklist,
                 inputs=system,
-                outputs=output
+                outputs=output,
+                concurrency_limit=LOOKUP_CONCURRENCY
             )
         
         # ====== About Tab ======
@@ -320,25 +409,46 @@ def create_interface():
             Stay secure! 🔒
             """)
     
+    demo.queue(default_concurrency_limit=QUEUE_CONCURRENCY, max_size=QUEUE_MAX_SIZE)
     return demo
 
+def wait_for_api() -> bool:
+    """
+    Wait for the FastAPI backend: HEAD probes over one kept-alive
+    connection, backing off from 50ms so a fast backend is seen at once
+    
+    Returns:
+        True if the API answered before READY_TIMEOUT
+    """
+    deadline = time.monotonic() + READY_TIMEOUT
+    delay = READY_INITIAL_DELAY
+    with httpx.Client(base_url=API_URL, timeout=READY_PROBE_TIMEOUT) as probe:
+        while True:
+            try:
+                if probe.head("/health").is_success:
+                    return True
+            except httpx.TransportError:
+                pass
+            if time.monotonic() + delay > deadline:
+                return False
+            time.sleep(delay)
+            delay = min(delay * 2, READY_MAX_DELAY)
+
 if __name__ == "__main__":
-    # Wait for FastAPI to be ready
-    import time
+    # Build the UI while the backend comes up instead of after it
     print("⏳ Waiting for API to be ready...")
-    for i in range(30):
-        try:
-            requests.get(f"{API_URL}/health")
-            print("✅ API is ready!")
-            break
-        except:
-            time.sleep(1)
-    
-    print("🚀 Starting Gradio interface with public sharing...")
+    ready = []
+    probe = threading.Thread(target=lambda: ready.append(wait_for_api()), daemon=True)
+    probe.start()
     demo = create_interface()
+    probe.join()
+    print("✅ API is ready!" if ready[0] else "⚠️ API did not answer, starting anyway")
+    
+    print("🚀 Starting Gradio interface" + (" with public sharing..." if SHARE_LINK else "..."))
     demo.launch(
-        share=True,
+        share=SHARE_LINK,
         show_error=True,
         server_name="0.0.0.0",
-        server_port=7860
+        server_port=7860,
+        max_threads=MAX_THREADS
     )
@@ -9,9 +9,7 @@ python web_app.py > /tmp/api.log 2>&1 &
 API_PID=$!
 echo "✅ FastAPI started (PID: $API_PID)"
 
-# Wait for API to be ready
-sleep 5
-
-# Start Gradio with public sharing
+# Start Gradio with public sharing; shared_app.py waits for the API
+# itself while it builds the UI
 echo "🚀 Starting Gradio interface..."
-python shared_app.py
+SPIDER_SHARE=1 python shared_app.py
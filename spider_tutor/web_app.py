@@ -5,28 +5,54 @@ FastAPI + Custom HTML/CSS
 """
 
 from fastapi import FastAPI, HTTPException
+from functools import lru_cache
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse, JSONResponse
-from pydantic import BaseModel
-from typing import Optional
+from fastapi.responses import FileResponse, JSONResponse, ORJSONResponse, StreamingResponse
+from pydantic import BaseModel, Field
+from starlette.routing import Route
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import asyncio
+import gzip
+import hashlib
 import json
 import os
+import random
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 # Import core modules
 from config import settings, SYSTEM_PROMPT
 from modules.ai_engine import AIEngine
 from modules.safety import check_safety
-from modules.knowledge_base import knowledge_base
+from modules.knowledge_base import knowledge_base, normalize_technique_id, HARDENING_CHECKLISTS
 
 # ============================================================================
 # FastAPI Setup
 # ============================================================================
 
-app = FastAPI(title="🕷️ Spider - Cybersecurity Tutor")
+# orjson encodes straight to UTF-8 bytes in native code; fall back to the
+# stdlib encoder when it isn't installed
+JSON_RESPONSE_CLASS = ORJSONResponse if ORJSON_AVAILABLE else JSONResponse
+
+app = FastAPI(
+    title="🕷️ Spider - Cybersecurity Tutor",
+    default_response_class=JSON_RESPONSE_CLASS
+)
+
+# Keyword fallback in /api/mitre returns at most this many techniques
+MITRE_SEARCH_LIMIT = 20
 
 # Initialize AI Engine (lazy)
 ai_engine = None
 
+# The engine keeps one shared conversation, so chat turns run one at a time;
+# waiting turns yield the event loop instead of blocking it
+_chat_lock = asyncio.Lock()
+
 def get_ai_engine():
     global ai_engine
     if ai_engine is None:
@@ -53,11 +79,19 @@ def get_ai_engine():
 class ChatMessage(BaseModel):
     message: str
 
+# Largest quiz a client can ask for (both UIs offer 1-20)
+MAX_QUIZ_QUESTIONS = 20
+
 class QuizRequest(BaseModel):
-    count: int = 5
+    # Bounds are checked by pydantic-core while decoding (422 otherwise)
+    count: int = Field(5, ge=1, le=MAX_QUIZ_QUESTIONS)
+
+# Longest /api/mitre query accepted (IDs look like "T1059.001"), so cache
+# keys and keyword scans stay bounded
+MAX_MITRE_QUERY_LENGTH = 64
 
 class MitreRequest(BaseModel):
-    tech_id: str
+    tech_id: str = Field(..., max_length=MAX_MITRE_QUERY_LENGTH)
 
 # ============================================================================
 # Routes
@@ -75,110 +109,317 @@ async def chat(data: ChatMessage):
         # Safety check
         is_safe, safety_message = check_safety(data.message)
         if not is_safe:
-            return JSONResponse({"error": safety_message}, status_code=400)
+            return JSON_RESPONSE_CLASS({"error": safety_message}, status_code=400)
         
         # Get response
         ai = get_ai_engine()
-        response = ai.chat(data.message, stream=False)
+        async with _chat_lock:
+            response = await ai.achat(data.message)
         
         return {"response": response}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.get("/api/flashcard")
-async def get_flashcard():
-    """Get random flashcard"""
-    try:
-        cards = knowledge_base.get_flashcards(count=1)
-        if cards:
-            card = cards[0]
-            return {
-                "question": card.question,
-                "answer": card.answer,
-                "category": card.category,
-                "difficulty": card.difficulty
-            }
-        return {"error": "No flashcards available"}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+def _sse(data: str, event: Optional[str] = None) -> bytes:
+    """Format one Server-Sent Event; data is JSON-encoded so newlines survive"""
+    frame = f"data: {json.dumps(data, ensure_ascii=False)}\n\n"
+    if event:
+        frame = f"event: {event}\n" + frame
+    return frame.encode("utf-8")
+
+@app.post("/api/chat/stream")
+async def chat_stream(data: ChatMessage):
+    """Chat endpoint that streams the reply as Server-Sent Events"""
+    is_safe, safety_message = check_safety(data.message)
+    if not is_safe:
+        return JSON_RESPONSE_CLASS({"error": safety_message}, status_code=400)
+    
+    ai = get_ai_engine()
+    
+    async def events():
+        try:
+            async with _chat_lock:
+                async for text in ai.astream_chat(data.message):
+                    yield _sse(text)
+        except Exception as e:
+            yield _sse(str(e), event="error")
+        yield _sse("", event="done")
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        # Keep proxies from buffering the stream
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+# Quiz items in response shape, built once; a quiz is a sample of these
+# (same distribution as knowledge_base.get_quiz, without rebuilding dicts)
+QUIZ_ITEMS = tuple(
+    {"question": card.question, "answer": card.answer}
+    for card in knowledge_base.flashcards
+)
 
 @app.post("/api/quiz")
 async def get_quiz(data: QuizRequest):
     """Get quiz questions"""
     try:
-        quiz = knowledge_base.get_quiz(count=data.count)
-        questions = []
-        for q in quiz:
-            questions.append({
-                "question": q.get("question", ""),
-                "answer": q.get("answer", "")
-            })
+        questions = random.sample(QUIZ_ITEMS, min(data.count, len(QUIZ_ITEMS)))
         return {"questions": questions}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+# Normalized ID -> response payload; lookups are pure (the knowledge base
+# is read-only), so repeat searches skip the index walk entirely
+MITRE_CACHE_SIZE = 512
+
+@lru_cache(maxsize=MITRE_CACHE_SIZE)
+def _mitre_lookup(tech_id: str) -> Dict[str, Any]:
+    """Build the /api/mitre payload for a validated technique ID ("T1566")"""
+    tech = knowledge_base.get_mitre_technique(tech_id)
+    if tech:
+        return {
+            "id": tech.technique_id,
+            "name": tech.name,
+            "description": tech.description
+        }
+    
+    # Unknown ID: match it as a substring of other IDs (e.g. sub-techniques)
+    return _mitre_search(tech_id[1:], tech_id)
+
+def _mitre_search(query: str, label: str) -> Dict[str, Any]:
+    """Keyword fallback for /api/mitre (free text is not cached)"""
+    results = knowledge_base.search_mitre(query)
+    if results:
+        return {
+            "results": [
+                {"id": t.technique_id, "name": t.name}
+                for t in results[:MITRE_SEARCH_LIMIT]
+            ]
+        }
+    
+    return {"error": f"Technique '{label}' not found"}
+
 @app.post("/api/mitre")
 async def search_mitre(data: MitreRequest):
     """Search MITRE ATT&CK"""
     try:
-        tech_id = data.tech_id.strip().upper()
-        if not tech_id.startswith("T"):
-            tech_id = "T" + tech_id
+        query = data.tech_id.strip()
+        if not query:
+            return {"error": "Please enter a technique ID (e.g., T1566)"}
         
-        tech = knowledge_base.get_mitre_technique(tech_id)
-        if tech:
-            return {
-                "id": tech.technique_id,
-                "name": tech.name,
-                "description": getattr(tech, "description", "N/A")
-            }
-        
-        # Try searching
-        results = knowledge_base.search_mitre(tech_id.replace("T", ""))
-        if results:
-            return {
-                "results": [
-                    {"id": t.technique_id, "name": t.name}
-                    for t in results
-                ]
-            }
-        
-        return {"error": f"Technique '{tech_id}' not found"}
+        # Same ID normalization as the Gradio UI
+        tech_id = normalize_technique_id(query)
+        if tech_id:
+            return _mitre_lookup(tech_id)
+        return _mitre_search(query, query)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.get("/api/incident-template")
-async def incident_template():
+# ============================================================================
+# Raw ASGI Endpoints
+# ============================================================================
+
+# Small read-only GET routes are served as plain ASGI apps, skipping
+# FastAPI's dependency resolution and Request/Response wrapping
+JSON_CONTENT_TYPE = (b"content-type", b"application/json")
+
+# Templates and checklists never change while the server runs, so clients
+# may revalidate with If-None-Match and get an empty 304
+STATIC_CACHE_CONTROL = (b"cache-control", b"public, max-age=3600")
+# Static payloads at least this big are also stored gzipped (compressed
+# once, not per request; streaming chat is never compressed)
+GZIP_MIN_SIZE = 500
+
+def _encode_json(payload: Dict[str, Any]) -> bytes:
+    """Encode a payload the same way as JSON_RESPONSE_CLASS"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(payload)
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+async def _send_response(send, status: int, headers: List[Tuple[bytes, bytes]], body: bytes = b""):
+    """Send a complete HTTP response over ASGI"""
+    await send({"type": "http.response.start", "status": status, "headers": headers})
+    await send({"type": "http.response.body", "body": body})
+
+async def _send_json(send, payload: Dict[str, Any], status: int = 200):
+    """Send a JSON payload"""
+    body = _encode_json(payload)
+    headers = [JSON_CONTENT_TYPE, (b"content-length", str(len(body)).encode())]
+    await _send_response(send, status, headers, body)
+
+def _header(scope, name: bytes) -> Optional[bytes]:
+    """Value of a request header (ASGI header names are lowercase)"""
+    for key, value in scope.get("headers", ()):
+        if key == name:
+            return value
+    return None
+
+def _etag_matches(scope, etag: bytes) -> bool:
+    """Check the request's If-None-Match header against an ETag"""
+    value = _header(scope, b"if-none-match")
+    if value is None:
+        return False
+    candidates = [c.strip() for c in value.split(b",")]
+    return b"*" in candidates or any(
+        c.removeprefix(b"W/") == etag for c in candidates
+    )
+
+def _accepts_gzip(scope) -> bool:
+    """Check whether the client's Accept-Encoding allows gzip"""
+    value = _header(scope, b"accept-encoding")
+    if not value:
+        return False
+    for item in value.lower().split(b","):
+        coding, _, params = item.partition(b";")
+        if coding.strip() in (b"gzip", b"*"):
+            q = params.replace(b" ", b"").removeprefix(b"q=")
+            try:
+                return not q or float(q) > 0
+            except ValueError:
+                return False
+    return False
+
+class JSONEndpoint:
+    """ASGI app returning handler(path_params) as JSON"""
+    
+    def __init__(self, handler: Callable[[Dict[str, str]], Dict[str, Any]]):
+        self.handler = handler
+    
+    async def __call__(self, scope, receive, send):
+        try:
+            payload = self.handler(scope.get("path_params", {}))
+        except Exception as e:
+            # Same body as HTTPException(500) so clients can read "detail"
+            await _send_json(send, {"detail": str(e)}, status=500)
+            return
+        await _send_json(send, payload)
+
+class StaticJSONEndpoint(JSONEndpoint):
+    """
+    JSONEndpoint for payloads that never change: each one is encoded,
+    gzipped and hashed once, then served with an ETag (304 when the client
+    has it)
+    
+    Args:
+        handler: Builds the payload from path params
+        key: Maps path params to the cache key; must have a small, fixed
+            range so the cache can't grow per request
+    """
+    
+    def __init__(self,
+                 handler: Callable[[Dict[str, str]], Dict[str, Any]],
+                 key: Callable[[Dict[str, str]], str] = lambda params: ""):
+        super().__init__(handler)
+        self.key = key
+        # key -> content-coding -> (body, etag)
+        self._cache: Dict[str, Dict[str, Tuple[bytes, bytes]]] = {}
+    
+    def warm(self, params: Dict[str, str]):
+        """Encode and hash the payload for params ahead of the first request"""
+        self._get(params)
+    
+    def _get(self, params: Dict[str, str]) -> Dict[str, Tuple[bytes, bytes]]:
+        key = self.key(params)
+        variants = self._cache.get(key)
+        if variants is None:
+            body = _encode_json(self.handler(params))
+            digest = hashlib.md5(body, usedforsecurity=False).hexdigest().encode()
+            variants = {"identity": (body, b'"' + digest + b'"')}
+            if len(body) >= GZIP_MIN_SIZE:
+                # Each encoding is a separate representation, so its own ETag
+                variants["gzip"] = (gzip.compress(body, compresslevel=9, mtime=0),
+                                    b'"' + digest + b'-gzip"')
+            self._cache[key] = variants
+        return variants
+    
+    async def __call__(self, scope, receive, send):
+        try:
+            variants = self._get(scope.get("path_params", {}))
+        except Exception as e:
+            await _send_json(send, {"detail": str(e)}, status=500)
+            return
+        coding = "gzip" if "gzip" in variants and _accepts_gzip(scope) else "identity"
+        body, etag = variants[coding]
+        headers = [(b"etag", etag), STATIC_CACHE_CONTROL, (b"vary", b"accept-encoding")]
+        if _etag_matches(scope, etag):
+            await _send_response(send, 304, headers)
+            return
+        headers += [JSON_CONTENT_TYPE, (b"content-length", str(len(body)).encode())]
+        if coding == "gzip":
+            headers.append((b"content-encoding", b"gzip"))
+        await _send_response(send, 200, headers, body)
+
+def get_flashcard(params: Dict[str, str]) -> Dict[str, Any]:
+    """Get random flashcard"""
+    cards = knowledge_base.get_flashcards(count=1)
+    if cards:
+        card = cards[0]
+        return {
+            "question": card.question,
+            "answer": card.answer,
+            "category": card.category,
+            "difficulty": card.difficulty
+        }
+    return {"error": "No flashcards available"}
+
+def incident_template(params: Dict[str, str]) -> Dict[str, Any]:
     """Get incident template"""
-    try:
-        template = knowledge_base.get_incident_template()
-        return {"template": template}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    return {"template": knowledge_base.get_incident_template()}
 
-@app.get("/api/vuln-template")
-async def vuln_template():
+def vuln_template(params: Dict[str, str]) -> Dict[str, Any]:
     """Get vulnerability template"""
-    try:
-        template = knowledge_base.get_vulnerability_template()
-        return {"template": template}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    return {"template": knowledge_base.get_vulnerability_template()}
 
-@app.get("/api/checklist/{system_type}")
-async def get_checklist(system_type: str = "general"):
+def get_checklist(params: Dict[str, str]) -> Dict[str, Any]:
     """Get hardening checklist"""
-    try:
-        checklist = knowledge_base.get_hardening_checklist(system_type)
-        return {"checklist": checklist}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    return {"checklist": knowledge_base.get_hardening_checklist(params.get("system_type", "general"))}
 
-@app.get("/health")
-async def health():
+def _checklist_key(params: Dict[str, str]) -> str:
+    """Unknown system types share the general checklist's cache entry"""
+    system_type = params.get("system_type", "general").lower()
+    return system_type if system_type in HARDENING_CHECKLISTS else "general"
+
+def health(params: Dict[str, str]) -> Dict[str, Any]:
     """Health check"""
     return {"status": "healthy"}
 
+incident_template_endpoint = StaticJSONEndpoint(incident_template)
+vuln_template_endpoint = StaticJSONEndpoint(vuln_template)
+checklist_endpoint = StaticJSONEndpoint(get_checklist, key=_checklist_key)
+
+# Class instances are mounted as raw ASGI apps (functions would be wrapped)
+app.router.routes.extend([
+    Route("/api/flashcard", JSONEndpoint(get_flashcard), methods=["GET"]),
+    Route("/api/incident-template", incident_template_endpoint, methods=["GET"]),
+    Route("/api/vuln-template", vuln_template_endpoint, methods=["GET"]),
+    Route("/api/checklist/{system_type}", checklist_endpoint, methods=["GET"]),
+    Route("/health", JSONEndpoint(health), methods=["GET"]),
+])
+
+@app.on_event("startup")
+async def precompute_static_payloads():
+    """Render every template/checklist body and ETag before serving, so
+    even the first request for each is a dict lookup"""
+    incident_template_endpoint.warm({})
+    vuln_template_endpoint.warm({})
+    for system_type in HARDENING_CHECKLISTS:
+        checklist_endpoint.warm({"system_type": system_type})
+
+@app.on_event("startup")
+async def warm_ai_engine():
+    """Build the AI engine (SDK import, client, connection prewarm) before
+    serving, instead of on the first chat request"""
+    await get_ai_engine().awarmup()
+
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    # One worker: the AI engine's conversation lives in this process.
+    # loop/http "auto" pick uvloop + httptools when installed
+    uvicorn.run(
+        app,
+        host="0.0.0.0",
+        port=8000,
+        loop="auto",
+        http="auto",
+        access_log=False
+    )